@@ -2,15 +2,17 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, timezone
-from collections import Counter
+from collections import Counter, deque
 import io
 import os
 import re
 import time
+import traceback
 import streamlit.components.v1 as components
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 import hashlib
+import hmac
 def stable_hash(*values) -> str:
     s = "||".join("" if v is None else str(v) for v in values)
     return hashlib.md5(s.encode()).hexdigest()[:8]
@@ -78,6 +80,16 @@ components.html(
 BST = timezone(timedelta(hours=1))
 UTC_PLUS_1 = BST  # Keep backward compatibility
 
+# Password for the Error Log tab
+ERROR_LOG_PASSWORD = "nan"
+
+# How long repeat Reporting updates with unchanged filters reuse the last results; other
+# users' writes show up on the first Update after this
+REPORT_RESULTS_TTL_SECONDS = 30
+
+# Most book matches listed for a Reporting search
+BOOK_SEARCH_LIMIT = 50
+
 # Error logging: capture all messages passed to st.error
 if "error_log" not in st.session_state:
     st.session_state.error_log = []
@@ -117,6 +129,21 @@ DESIGN_USERS_LIST = [
 ]
 ALL_USERS_LIST = EDITORIAL_USERS_LIST + DESIGN_USERS_LIST
 
+# Assignment dropdown options per stage type
+EDITORIAL_USER_OPTIONS = ("Not set", *EDITORIAL_USERS_LIST)
+DESIGN_USER_OPTIONS = ("Not set", *DESIGN_USERS_LIST)
+EDITORIAL_STAGES = frozenset(
+    {
+        "Editorial R&D",
+        "Editorial Writing",
+        "1st Edit",
+        "2nd Edit",
+        "1st Proof",
+        "2nd Proof",
+        "Editorial Sign Off",
+    }
+)
+
 # Map first names (and common short forms) to full user names
 FIRST_NAME_TO_FULL = {name.split()[0].lower(): name for name in ALL_USERS_LIST}
 FIRST_NAME_TO_FULL.update({
@@ -124,6 +151,128 @@ FIRST_NAME_TO_FULL.update({
     "ker ker": "Ker Ker Lee",
 })
 
+# Fallback estimates in seconds, used when a book has no estimates stored
+DEFAULT_STAGE_ESTIMATES = {
+    'Editorial R&D': 7200,  # 2 hours
+    'Editorial Writing': 28800,  # 8 hours
+    '1st Edit': 14400,  # 4 hours
+    '2nd Edit': 7200,  # 2 hours
+    'Design R&D': 10800,  # 3 hours
+    'In Design': 21600,  # 6 hours
+    '1st Proof': 7200,  # 2 hours
+    '2nd Proof': 5400,  # 1.5 hours
+    'Editorial Sign Off': 1800,  # 30 minutes
+    'Design Sign Off': 1800,  # 30 minutes
+}
+
+# HTML templates for the per-book progress header; only the values vary per book
+PROGRESS_BAR_TEMPLATE = (
+    '<div style="width: 50%; background-color: #f0f0f0; border-radius: 5px; height: 10px; margin: 8px 0;">'
+    '<div style="width: {pct:.1f}%; background-color: #2AA395; height: 100%; border-radius: 5px;"></div>'
+    '</div>'
+)
+PROGRESS_TEXT_TEMPLATE = '<div style="font-size: 14px; color: #666; margin-bottom: 10px;">{text}</div>'
+TAG_TEMPLATE = '<div style="font-size: 14px; color: #888; margin-bottom: 10px;"><strong>Tags:</strong> {tags}</div>'
+
+# Upsert a running timer so it survives app restarts
+SAVE_ACTIVE_TIMER_SQL = text(
+    '''
+    INSERT INTO active_timers (timer_key, card_name, user_name, list_name,
+        board_name, start_time, accumulated_seconds, is_paused, created_at)
+    VALUES (:timer_key, :card_name, :user_name, :list_name, :board_name,
+        :start_time, :accumulated_seconds, :is_paused, CURRENT_TIMESTAMP)
+    ON CONFLICT (timer_key) DO UPDATE SET
+        start_time = EXCLUDED.start_time,
+        accumulated_seconds = EXCLUDED.accumulated_seconds,
+        is_paused = EXCLUDED.is_paused,
+        created_at = CURRENT_TIMESTAMP
+'''
+)
+
+DELETE_ACTIVE_TIMER_SQL = text('DELETE FROM active_timers WHERE timer_key = :timer_key')
+
+# Record a stopped timer session and remove its active timer in a single statement.
+# The board comes from the active timer row (both parts see the same snapshot), and
+# a duplicate session updates the existing row, keeping its tag when none is given.
+SAVE_TIMER_ENTRY_SQL = text(
+    '''
+    WITH saved AS (
+        INSERT INTO trello_time_tracking
+        (card_name, user_name, list_name, time_spent_seconds,
+         date_started, session_start_time, board_name, tag)
+        SELECT :card_name, :user_name, :list_name, :time_spent_seconds,
+               :date_started, :session_start_time,
+               COALESCE(
+                   (SELECT NULLIF(board_name, '') FROM active_timers WHERE timer_key = :timer_key),
+                   'Manual Entry'
+               ),
+               :tag
+        ON CONFLICT (card_name, user_name, list_name, date_started, time_spent_seconds)
+        DO UPDATE SET
+            session_start_time = EXCLUDED.session_start_time,
+            board_name = EXCLUDED.board_name,
+            tag = COALESCE(EXCLUDED.tag, trello_time_tracking.tag),
+            created_at = CURRENT_TIMESTAMP
+        RETURNING 1
+    )
+    DELETE FROM active_timers WHERE timer_key = :timer_key
+'''
+)
+
+# Add manually entered time to a task, preserving its completion status
+INSERT_MANUAL_TIME_SQL = text(
+    '''
+    INSERT INTO trello_time_tracking
+    (card_name, user_name, list_name, time_spent_seconds, board_name, created_at, tag, completed)
+    VALUES (:card_name, :user_name, :list_name, :time_spent_seconds, :board_name, :created_at, :tag, :completed)
+'''
+)
+
+# Archive a book's time records (or add a placeholder if it has none) and the book itself
+ARCHIVE_BOOK_SQL = text(
+    '''
+    WITH archived_rows AS (
+        UPDATE trello_time_tracking
+        SET archived = TRUE
+        WHERE card_name = :card_name
+        RETURNING 1
+    ), placeholder AS (
+        INSERT INTO trello_time_tracking
+        (card_name, user_name, list_name, time_spent_seconds,
+         card_estimate_seconds, board_name, archived, created_at)
+        SELECT :card_name, 'Not set', 'No tasks assigned', 0,
+               0, 'Manual Entry', TRUE, NOW()
+        WHERE NOT EXISTS (SELECT 1 FROM archived_rows)
+    )
+    UPDATE books
+    SET archived = TRUE
+    WHERE card_name = :card_name
+'''
+)
+
+# Book-level statements take a list of titles so bulk actions are a single round trip
+DELETE_BOOK_TIME_SQL = text('DELETE FROM trello_time_tracking WHERE card_name = ANY(:card_names)')
+
+COUNT_ARCHIVED_SQL = text('SELECT COUNT(*) FROM trello_time_tracking WHERE archived = TRUE')
+
+UNARCHIVE_BOOK_TIME_SQL = text(
+    'UPDATE trello_time_tracking SET archived = FALSE WHERE card_name = ANY(:card_names)'
+)
+
+# Single-row placeholder used for books that have no tasks yet
+EMPTY_BOOK_TEMPLATE = pd.DataFrame(
+    {
+        'Card name': [None],
+        'User': ['Not set'],
+        'List': ['No tasks assigned'],
+        'Time spent (s)': [0],
+        'Date started (f)': [None],
+        'Card estimate(s)': [0],
+        'Board': ['Not set'],
+        'Tag': [None],
+    }
+)
+
 def normalize_user_name(name):
     """Return a canonical user name from various CSV formats."""
     if name is None:
@@ -146,6 +295,52 @@ def normalize_user_name(name):
     return name
 
 
+def add_flash_message(task_key, message):
+    """Queue a success message to show under a task on the next render."""
+    st.session_state.flash_messages.append((task_key, message))
+
+
+def pop_flash_messages(task_key):
+    """Return and remove the queued success messages for a task."""
+    queued = st.session_state.flash_messages
+    messages = [message for key, message in queued if key == task_key]
+    if messages:
+        remaining = [(key, message) for key, message in queued if key != task_key]
+        queued.clear()
+        queued.extend(remaining)
+    return messages
+
+
+def bump_data_version():
+    """Invalidate cached book data after this session writes to the database."""
+    st.session_state['_data_version'] = st.session_state.get('_data_version', 0) + 1
+    get_cached_task_completion.clear()
+    get_filter_options.clear()
+    load_archived_books.clear()
+
+
+def mutate_book_data(engine, statement, params):
+    """Run one write in its own transaction and invalidate cached book data."""
+    with engine.begin() as conn:
+        conn.execute(statement, params)
+    bump_data_version()
+
+
+def change_book_page(step):
+    """Move the Book Progress page index; used as a button callback."""
+    st.session_state.book_page = max(0, st.session_state.get('book_page', 0) + step)
+
+
+def toggle_archive_details(book_title):
+    """Show or hide an archived book's details; used as a button callback."""
+    st.session_state.setdefault('archive_open', set()).symmetric_difference_update({book_title})
+
+
+def track_book_stage_key(book_title, stage_name, key):
+    """Record a session state key against its book/stage so it can be cleared without scanning."""
+    st.session_state.setdefault('_keys_by_book_stage', {}).setdefault((book_title, stage_name), set()).add(key)
+
+
 @st.cache_resource
 def init_database():
     """Initialise database connection and create tables"""
@@ -159,7 +354,9 @@ def init_database():
             )
             return None
 
-        engine = create_engine(database_url)
+        # The engine is cached for the process, so pooled connections are reused across reruns;
+        # pre-ping replaces connections the server has dropped instead of failing the next query
+        engine = create_engine(database_url, pool_pre_ping=True)
 
         # Create table if it doesn't exist
         with engine.connect() as conn:
@@ -366,13 +563,49 @@ def init_database():
                 pass
             conn.commit()
 
+        # Indexes for the archive tab (partial, so only archived rows are indexed) and per-book lookups.
+        # Own transaction, so an aborted migration above can't roll them back
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    '''
+                CREATE INDEX IF NOT EXISTS idx_tt_archived_created
+                ON trello_time_tracking (created_at DESC) WHERE archived = TRUE
+            '''
+                )
+            )
+            conn.execute(
+                text(
+                    '''
+                CREATE INDEX IF NOT EXISTS idx_tt_card_name
+                ON trello_time_tracking (card_name)
+            '''
+                )
+            )
+
+        # Trigram index for substring title searches; optional, as pg_trgm may not be available
+        try:
+            with engine.begin() as conn:
+                conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+                conn.execute(
+                    text(
+                        '''
+                    CREATE INDEX IF NOT EXISTS trello_card_name_trgm
+                    ON trello_time_tracking USING gin (card_name gin_trgm_ops)
+                '''
+                    )
+                )
+        except Exception:
+            # Searches still work without the index, just with a full scan
+            pass
+
         return engine
     except Exception as e:
         st.error(f"Database initialisation failed: {str(e)}")
         return None
 
 
-def get_users_from_database(_engine):
+def get_users_from_database(_engine, raise_errors=False):
     """Get list of unique users from database with retry logic"""
     max_retries = 3
     for attempt in range(max_retries):
@@ -388,12 +621,14 @@ def get_users_from_database(_engine):
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
+            elif raise_errors:
+                raise
             else:
                 return []
     return []
 
 
-def get_tags_from_database(_engine):
+def get_tags_from_database(_engine, raise_errors=False):
     """Get list of unique individual tags from database, splitting comma-separated values"""
     max_retries = 3
     for attempt in range(max_retries):
@@ -422,6 +657,8 @@ def get_tags_from_database(_engine):
                 # Wait before retrying
                 time.sleep(0.5)
                 continue
+            elif raise_errors:
+                raise
             else:
                 # Final attempt failed, return empty list instead of showing error
                 return []
@@ -429,7 +666,7 @@ def get_tags_from_database(_engine):
     return []
 
 
-def get_books_from_database(_engine):
+def get_books_from_database(_engine, raise_errors=False):
     """Get list of unique book names from database with retry logic"""
     max_retries = 3
     for attempt in range(max_retries):
@@ -446,12 +683,35 @@ def get_books_from_database(_engine):
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
+            elif raise_errors:
+                raise
             else:
                 return []
     return []
 
 
-def get_boards_from_database(_engine):
+def like_substring_pattern(search):
+    """Escape LIKE wildcards in search and wrap it for a plain substring ILIKE ... ESCAPE '\\' match"""
+    escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_books_matching(_engine, search, limit=BOOK_SEARCH_LIMIT):
+    """Get book names containing the search text (case-insensitive); returns limit + 1 names when capped"""
+    # Errors propagate to the caller, so a failed lookup isn't cached as "no matches"
+    with _engine.connect() as conn:
+        result = conn.execute(
+            text(
+                "SELECT DISTINCT card_name FROM trello_time_tracking "
+                "WHERE card_name ILIKE :pattern ESCAPE '\\' ORDER BY card_name LIMIT :limit"
+            ),
+            {'pattern': like_substring_pattern(search), 'limit': limit + 1},
+        )
+        return [row[0] for row in result]
+
+
+def get_boards_from_database(_engine, raise_errors=False):
     """Get list of unique board names from database with retry logic"""
     max_retries = 3
     for attempt in range(max_retries):
@@ -468,11 +728,25 @@ def get_boards_from_database(_engine):
             if attempt < max_retries - 1:
                 time.sleep(0.5)
                 continue
+            elif raise_errors:
+                raise
             else:
                 return []
     return []
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def get_filter_options(_engine):
+    """Get the Reporting filter dropdown values, cached across reruns"""
+    # Lookups raise once their retries are used up, so a failure isn't cached as empty lists
+    return (
+        get_users_from_database(_engine, raise_errors=True),
+        get_books_from_database(_engine, raise_errors=True),
+        get_boards_from_database(_engine, raise_errors=True),
+        get_tags_from_database(_engine, raise_errors=True),
+    )
+
+
 def emergency_stop_all_timers(engine):
     """Emergency function to stop all active timers and save progress when database connection fails"""
     try:
@@ -531,10 +805,11 @@ def emergency_stop_all_timers(engine):
 
                                         # Remove from active timers table
                                         conn.execute(
-                                            text('DELETE FROM active_timers WHERE timer_key = :timer_key'),
+                                            DELETE_ACTIVE_TIMER_SQL,
                                             {'timer_key': timer_key},
                                         )
                                         conn.commit()
+                                        bump_data_version()
                                         saved_timers += 1
                                         break
                                 except Exception:
@@ -599,6 +874,7 @@ def recover_emergency_saved_times(engine):
                         },
                     )
                     conn.commit()
+                    bump_data_version()
                     saved_count += 1
             except Exception:
                 continue  # Skip if unable to save
@@ -646,7 +922,7 @@ def load_active_timers(engine):
                 if 'timer_accumulated_time' not in st.session_state:
                     st.session_state.timer_accumulated_time = {}
                 if 'timer_session_counts' not in st.session_state:
-                    st.session_state.timer_session_counts = {}
+                    st.session_state.timer_session_counts = Counter()
 
                 # Ensure timezone-aware datetime for consistency
                 if start_time.tzinfo is None:
@@ -659,7 +935,6 @@ def load_active_timers(engine):
                 st.session_state.timer_start_times[timer_key] = start_time_with_tz
                 st.session_state.timer_paused[timer_key] = is_paused
                 st.session_state.timer_accumulated_time[timer_key] = accumulated_seconds
-                st.session_state.timer_session_counts.setdefault(timer_key, 0)
 
                 active_timers.append(
                     {
@@ -715,19 +990,7 @@ def save_active_timer(
                 start_time_with_tz = start_time
 
             conn.execute(
-                text(
-                    '''
-                INSERT INTO active_timers (timer_key, card_name, user_name, list_name,
-                    board_name, start_time, accumulated_seconds, is_paused, created_at)
-                VALUES (:timer_key, :card_name, :user_name, :list_name, :board_name,
-                    :start_time, :accumulated_seconds, :is_paused, CURRENT_TIMESTAMP)
-                ON CONFLICT (timer_key) DO UPDATE SET
-                    start_time = EXCLUDED.start_time,
-                    accumulated_seconds = EXCLUDED.accumulated_seconds,
-                    is_paused = EXCLUDED.is_paused,
-                    created_at = CURRENT_TIMESTAMP
-            '''
-                ),
+                SAVE_ACTIVE_TIMER_SQL,
                 {
                     'timer_key': timer_key,
                     'card_name': card_name,
@@ -793,21 +1056,13 @@ def update_active_timer_state(
 def remove_active_timer(engine, timer_key):
     """Remove active timer from database"""
     try:
-        with engine.connect() as conn:
-            conn.execute(
-                text(
-                    '''
-                DELETE FROM active_timers WHERE timer_key = :timer_key
-            '''
-                ),
-                {'timer_key': timer_key},
-            )
-            conn.commit()
+        with engine.begin() as conn:
+            conn.execute(DELETE_ACTIVE_TIMER_SQL, {'timer_key': timer_key})
     except Exception as e:
         st.error(f"Error removing active timer: {str(e)}")
 
 
-def stop_active_timer(engine, timer_key):
+def stop_active_timer(engine, timer_key, tag=None):
     """Stop a running timer and save its elapsed time."""
     if timer_key not in st.session_state.get('timers', {}):
         return
@@ -828,59 +1083,46 @@ def stop_active_timer(engine, timer_key):
     list_name = parts[-2]
     user_name = parts[-1]
 
-    board_name = 'Manual Entry'
-    try:
-        with engine.connect() as conn:
-            res = conn.execute(
-                text('SELECT board_name FROM active_timers WHERE timer_key = :timer_key'), {'timer_key': timer_key}
-            )
-            row = res.fetchone()
-            if row and row[0]:
-                board_name = row[0]
-    except Exception:
-        pass
+    # Save to database only if time > 0
+    timer_saved = False
+    if elapsed_seconds > 0:
+        session_start = start_time or datetime.now(BST)
+        try:
+            # Save the session and clear the active timer in one round trip
+            with engine.begin() as conn:
+                conn.execute(
+                    SAVE_TIMER_ENTRY_SQL,
+                    {
+                        'card_name': card_name,
+                        'user_name': user_name,
+                        'list_name': list_name,
+                        'time_spent_seconds': elapsed_seconds,
+                        'date_started': session_start.date(),
+                        'session_start_time': session_start,
+                        'tag': tag,
+                        'timer_key': timer_key,
+                    },
+                )
+            bump_data_version()
+            timer_saved = True
 
-    try:
-        with engine.connect() as conn:
-            conn.execute(
-                text(
-                    '''
-                INSERT INTO trello_time_tracking
-                (card_name, user_name, list_name, time_spent_seconds,
-                 date_started, session_start_time, board_name)
-                VALUES (:card_name, :user_name, :list_name, :time_spent_seconds,
-                        :date_started, :session_start_time, :board_name)
-                ON CONFLICT (card_name, user_name, list_name, date_started, time_spent_seconds)
-                DO UPDATE SET
-                    session_start_time = EXCLUDED.session_start_time,
-                    board_name = EXCLUDED.board_name,
-                    created_at = CURRENT_TIMESTAMP
-            '''
-                ),
-                {
-                    'card_name': card_name,
-                    'user_name': user_name,
-                    'list_name': list_name,
-                    'time_spent_seconds': elapsed_seconds,
-                    'date_started': (start_time or datetime.now(BST)).date(),
-                    'session_start_time': start_time or datetime.now(BST),
-                    'board_name': board_name,
-                },
+            # Confirmation shown under the task after the rerun
+            add_flash_message(
+                timer_key, f"Added {format_seconds_to_time(elapsed_seconds)} to {card_name} - {list_name}"
             )
-            conn.execute(text('DELETE FROM active_timers WHERE timer_key = :timer_key'), {'timer_key': timer_key})
-            conn.commit()
-    except Exception as e:
-        st.error(f"Error saving timer data: {str(e)}")
+        except Exception as e:
+            st.error(f"Error saving timer data: {str(e)}")
 
+    # If nothing was saved, still clean up the active timer
+    if not timer_saved:
+        remove_active_timer(engine, timer_key)
+
+    # Clear timer states; the running flag goes last, right before the rerun
+    st.session_state.timer_start_times.pop(timer_key, None)
+    st.session_state.timer_accumulated_time.pop(timer_key, None)
+    st.session_state.timer_paused.pop(timer_key, None)
+    st.session_state.timer_session_counts[timer_key] += 1
     st.session_state.timers[timer_key] = False
-    if timer_key in st.session_state.timer_start_times:
-        del st.session_state.timer_start_times[timer_key]
-    if timer_key in st.session_state.timer_accumulated_time:
-        del st.session_state.timer_accumulated_time[timer_key]
-    if timer_key in st.session_state.timer_paused:
-        del st.session_state.timer_paused[timer_key]
-    st.session_state.setdefault('timer_session_counts', {})
-    st.session_state.timer_session_counts[timer_key] = st.session_state.timer_session_counts.get(timer_key, 0) + 1
     st.rerun()
 
 
@@ -971,7 +1213,7 @@ if (!paused) {{
                             pause_label = "Resume" if paused else "Pause"
                             if st.button(pause_label, key=f"summary_pause_{task_key}"):
                                 if paused:
-                                    resume_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(BST)
+                                    resume_time = datetime.now(BST)
                                     st.session_state.timer_start_times[task_key] = resume_time
                                     st.session_state.timer_paused[task_key] = False
                                     update_active_timer_state(engine, task_key, accumulated, False, resume_time)
@@ -1008,6 +1250,7 @@ def update_task_completion(engine, card_name, user_name, list_name, completed):
                 {'completed': completed, 'card_name': card_name, 'user_name': user_name, 'list_name': list_name},
             )
             conn.commit()
+            bump_data_version()
 
             # Verify the update worked
             rows_affected = result.rowcount
@@ -1021,26 +1264,32 @@ def update_task_completion(engine, card_name, user_name, list_name, completed):
 def get_task_completion(engine, card_name, user_name, list_name):
     """Get task completion status"""
     try:
-        with engine.connect() as conn:
-            result = conn.execute(
-                text(
-                    """
-                SELECT completed FROM trello_time_tracking
-                WHERE card_name = :card_name
-                AND COALESCE(user_name, 'Not set') = :user_name
-                AND list_name = :list_name
-                LIMIT 1
-            """
-                ),
-                {'card_name': card_name, 'user_name': user_name, 'list_name': list_name},
-            )
-            row = result.fetchone()
-            return row[0] if row else False
+        return get_cached_task_completion(engine, card_name, user_name, list_name)
     except Exception as e:
         st.error(f"Error getting task completion: {str(e)}")
         return False
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def get_cached_task_completion(_engine, card_name, user_name, list_name):
+    """Get task completion status, cached briefly across reruns; errors propagate so they aren't cached"""
+    with _engine.connect() as conn:
+        result = conn.execute(
+            text(
+                """
+            SELECT completed FROM trello_time_tracking
+            WHERE card_name = :card_name
+            AND COALESCE(user_name, 'Not set') = :user_name
+            AND list_name = :list_name
+            LIMIT 1
+        """
+            ),
+            {'card_name': card_name, 'user_name': user_name, 'list_name': list_name},
+        )
+        row = result.fetchone()
+        return row[0] if row else False
+
+
 def get_task_estimate(engine, card_name, user_name, list_name):
     """Return estimated time for a task in seconds."""
 
@@ -1072,40 +1321,6 @@ def get_task_estimate(engine, card_name, user_name, list_name):
         return 0
 
 
-def check_all_tasks_completed(engine, card_name):
-    """Check if all tasks for a book are completed"""
-    try:
-        with engine.connect() as conn:
-            # Get all tasks for this book - need to check each user/stage combination
-            result = conn.execute(
-                text(
-                    """
-                SELECT list_name, COALESCE(user_name, 'Not set') as user_name,
-                       BOOL_AND(COALESCE(completed, false)) as all_completed
-                FROM trello_time_tracking
-                WHERE card_name = :card_name
-                AND archived = FALSE
-                GROUP BY list_name, COALESCE(user_name, 'Not set')
-            """
-                ),
-                {'card_name': card_name},
-            )
-
-            task_groups = result.fetchall()
-            if not task_groups:
-                return False
-
-            # Check if all task groups are completed
-            for task_group in task_groups:
-                if not task_group[2]:  # all_completed column
-                    return False
-
-            return True
-    except Exception as e:
-        st.error(f"Error checking book completion: {str(e)}")
-        return False
-
-
 def delete_task_stage(engine, card_name, user_name, list_name):
     """Delete a specific task stage from the database"""
     try:
@@ -1122,6 +1337,7 @@ def delete_task_stage(engine, card_name, user_name, list_name):
                 {'card_name': card_name, 'user_name': user_name, 'list_name': list_name},
             )
             conn.commit()
+            bump_data_version()
             return True
     except Exception as e:
         st.error(f"Error deleting task stage: {str(e)}")
@@ -1145,6 +1361,7 @@ def create_book_record(engine, card_name, board_name=None, tag=None):
                 {'card_name': card_name, 'board_name': board_name, 'tag': tag},
             )
             conn.commit()
+            bump_data_version()
             return True
     except Exception as e:
         st.error(f"Error creating book record: {str(e)}")
@@ -1177,6 +1394,11 @@ def get_all_books(engine):
 
 def get_available_stages_for_book(engine, card_name):
     """Get stages not yet associated with a book"""
+    return get_available_stages_for_books(engine, [card_name]).get(card_name, [])
+
+
+def get_available_stages_for_books(engine, card_names):
+    """Get stages not yet associated with each of the given books in one query"""
     all_stages = [
         "Editorial R&D",
         "Editorial Writing",
@@ -1195,20 +1417,24 @@ def get_available_stages_for_book(engine, card_name):
             result = conn.execute(
                 text(
                     """
-                SELECT DISTINCT list_name
+                SELECT DISTINCT card_name, list_name
                 FROM trello_time_tracking
-                WHERE card_name = :card_name AND archived = FALSE
+                WHERE card_name = ANY(:card_names) AND archived = FALSE
             """
                 ),
-                {'card_name': card_name},
+                {'card_names': list(card_names)},
             )
 
-            existing_stages = [row[0] for row in result.fetchall()]
-            available_stages = [stage for stage in all_stages if stage not in existing_stages]
-            return available_stages
+            existing_stages = {card_name: set() for card_name in card_names}
+            for card_name, list_name in result.fetchall():
+                existing_stages[card_name].add(list_name)
+            return {
+                card_name: [stage for stage in all_stages if stage not in stages]
+                for card_name, stages in existing_stages.items()
+            }
     except Exception as e:
         st.error(f"Error getting available stages: {str(e)}")
-        return []
+        return {}
 
 
 def add_stage_to_book(engine, card_name, stage_name, board_name=None, tag=None, estimate_seconds=3600):
@@ -1235,6 +1461,7 @@ def add_stage_to_book(engine, card_name, stage_name, board_name=None, tag=None,
                 },
             )
             conn.commit()
+            bump_data_version()
             return True
     except Exception as e:
         st.error(f"Error adding stage: {str(e)}")
@@ -1329,66 +1556,83 @@ def import_books_from_csv(engine, df):
                 total_entries += 1
 
             conn.commit()
+            bump_data_version()
 
     return True, f"Imported {total_entries} stage entries from CSV"
 
 
+def build_filtered_tasks_query(
+    select_clause, user_name=None, book_name=None, board_name=None, tag_name=None, start_date=None, end_date=None
+):
+    """Build the per-task summary query and params for the Reporting filters"""
+    query = '''
+        WITH task_summary AS (
+            SELECT card_name, list_name, COALESCE(user_name, 'Not set') as user_name, board_name, tag,
+                   SUM(time_spent_seconds) as total_time,
+                   MAX(card_estimate_seconds) as estimated_seconds,
+                   MIN(CASE WHEN session_start_time IS NOT NULL THEN session_start_time END) as first_session
+            FROM trello_time_tracking
+            WHERE 1=1
+    '''
+    params = {}
+
+    # Add filters based on provided parameters
+    if user_name and user_name != "All Users":
+        query += ' AND COALESCE(user_name, \'Not set\') = :user_name'
+        params['user_name'] = user_name
+
+    if book_name and book_name != "All Books":
+        query += ' AND card_name = :book_name'
+        params['book_name'] = book_name
+
+    if board_name and board_name != "All Boards":
+        query += ' AND board_name = :board_name'
+        params['board_name'] = board_name
+
+    if tag_name and tag_name != "All Tags":
+        query += ' AND (tag = :tag_name OR tag LIKE :tag_name_pattern1 OR tag LIKE :tag_name_pattern2 OR tag LIKE :tag_name_pattern3)'
+        params['tag_name'] = tag_name
+        params['tag_name_pattern1'] = f'{tag_name},%'  # Tag at start
+        params['tag_name_pattern2'] = f'%, {tag_name},%'  # Tag in middle
+        params['tag_name_pattern3'] = f'%, {tag_name}'  # Tag at end
+
+    query += f'''
+            GROUP BY card_name, list_name, COALESCE(user_name, 'Not set'), board_name, tag
+        )
+        SELECT {select_clause}
+        FROM task_summary
+    '''
+
+    # Add date filtering to the main query if needed
+    if start_date or end_date:
+        date_conditions = []
+        if start_date:
+            date_conditions.append('first_session >= :start_date')
+            params['start_date'] = start_date
+        if end_date:
+            date_conditions.append('first_session <= :end_date')
+            params['end_date'] = end_date
+
+        if date_conditions:
+            query += ' WHERE ' + ' AND '.join(date_conditions)
+
+    return query, params
+
+
 def get_filtered_tasks_from_database(
     _engine, user_name=None, book_name=None, board_name=None, tag_name=None, start_date=None, end_date=None
 ):
     """Get filtered tasks from database with multiple filter options"""
     try:
-        query = '''
-            WITH task_summary AS (
-                SELECT card_name, list_name, COALESCE(user_name, 'Not set') as user_name, board_name, tag,
-                       SUM(time_spent_seconds) as total_time,
-                       MAX(card_estimate_seconds) as estimated_seconds,
-                       MIN(CASE WHEN session_start_time IS NOT NULL THEN session_start_time END) as first_session
-                FROM trello_time_tracking
-                WHERE 1=1
-        '''
-        params = {}
-
-        # Add filters based on provided parameters
-        if user_name and user_name != "All Users":
-            query += ' AND COALESCE(user_name, \'Not set\') = :user_name'
-            params['user_name'] = user_name
-
-        if book_name and book_name != "All Books":
-            query += ' AND card_name = :book_name'
-            params['book_name'] = book_name
-
-        if board_name and board_name != "All Boards":
-            query += ' AND board_name = :board_name'
-            params['board_name'] = board_name
-
-        if tag_name and tag_name != "All Tags":
-            query += ' AND (tag = :tag_name OR tag LIKE :tag_name_pattern1 OR tag LIKE :tag_name_pattern2 OR tag LIKE :tag_name_pattern3)'
-            params['tag_name'] = tag_name
-            params['tag_name_pattern1'] = f'{tag_name},%'  # Tag at start
-            params['tag_name_pattern2'] = f'%, {tag_name},%'  # Tag in middle
-            params['tag_name_pattern3'] = f'%, {tag_name}'  # Tag at end
-
-        query += '''
-                GROUP BY card_name, list_name, COALESCE(user_name, 'Not set'), board_name, tag
-            )
-            SELECT card_name, list_name, user_name, board_name, tag, first_session, total_time, estimated_seconds
-            FROM task_summary
-        '''
-
-        # Add date filtering to the main query if needed
-        if start_date or end_date:
-            date_conditions = []
-            if start_date:
-                date_conditions.append('first_session >= :start_date')
-                params['start_date'] = start_date
-            if end_date:
-                date_conditions.append('first_session <= :end_date')
-                params['end_date'] = end_date
-
-            if date_conditions:
-                query += ' WHERE ' + ' AND '.join(date_conditions)
-
+        query, params = build_filtered_tasks_query(
+            'card_name, list_name, user_name, board_name, tag, first_session, total_time, estimated_seconds',
+            user_name=user_name,
+            book_name=book_name,
+            board_name=board_name,
+            tag_name=tag_name,
+            start_date=start_date,
+            end_date=end_date,
+        )
         query += ' ORDER BY first_session DESC, card_name, list_name'
 
         with _engine.connect() as conn:
@@ -1432,6 +1676,8 @@ def get_filtered_tasks_from_database(
                         'Time Allocation': format_seconds_to_time(estimated_time) if estimated_time > 0 else 'Not Set',
                         'Time Spent': format_seconds_to_time(total_time),
                         'Completion %': completion_percentage,
+                        # Raw seconds for the Summary totals; removed before the table is shown
+                        'Time spent (s)': total_time or 0,
                     }
                 )
             return pd.DataFrame(data)
@@ -1453,6 +1699,18 @@ def format_seconds_to_time(seconds):
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
 
+def format_seconds_series(seconds):
+    """Convert a Series of seconds to hh:mm:ss strings, matching format_seconds_to_time"""
+    # Truncate like int() and split into h/m/s with array arithmetic; only the final strings are built per row
+    total = seconds.fillna(0).to_numpy(dtype=float).astype(np.int64)
+    hours, remainder = np.divmod(total, 3600)
+    minutes, secs = np.divmod(remainder, 60)
+    return pd.Series(
+        [f"{h:02d}:{m:02d}:{s:02d}" for h, m, s in zip(hours.tolist(), minutes.tolist(), secs.tolist())],
+        index=seconds.index,
+    )
+
+
 def render_basic_js_timer(timer_id, status_label, elapsed_seconds, paused):
     """Render a simple JavaScript-based timer."""
     elapsed_str = format_seconds_to_time(elapsed_seconds)
@@ -1516,6 +1774,38 @@ def parse_hours_minutes(value):
         return 0.0
 
 
+def parse_manual_time(value):
+    """Parse an hh:mm:ss manual entry into seconds, returning (seconds, error message)"""
+    time_parts = value.split(':')
+    if len(time_parts) != 3:
+        return None, "Please use format hh:mm:ss (e.g., 01:30:00)"
+
+    try:
+        hours = int(time_parts[0])
+        minutes = int(time_parts[1])
+        seconds = int(time_parts[2])
+    except ValueError:
+        return None, "Please enter valid numbers in hh:mm:ss format"
+
+    # Validate individual components
+    if hours > 100:
+        return None, f"Maximum hours allowed is 100. You entered {hours} hours."
+    if minutes >= 60:
+        return None, f"Minutes must be less than 60. You entered {minutes} minutes."
+    if seconds >= 60:
+        return None, f"Seconds must be less than 60. You entered {seconds} seconds."
+
+    total_seconds = hours * 3600 + minutes * 60 + seconds
+
+    # Validate maximum time (100 hours = 360,000 seconds)
+    if total_seconds > 100 * 3600:
+        return None, f"Maximum time allowed is 100:00:00. You entered {value}"
+    if total_seconds <= 0:
+        return None, "Time must be greater than 00:00:00"
+
+    return total_seconds, None
+
+
 def calculate_timer_elapsed_time(start_time):
     """Calculate elapsed time from start_time to now using UTC for accuracy"""
     if not start_time:
@@ -1576,8 +1866,8 @@ def process_book_summary(df):
                 'Book Title': total_time.index,
                 'Board': boards.values,
                 'Main User': main_user_series.values,
-                'Time Spent': total_time.apply(format_seconds_to_time).values,
-                'Estimated Time': estimated.fillna(0).apply(format_seconds_to_time).values,
+                'Time Spent': format_seconds_series(total_time).values,
+                'Estimated Time': format_seconds_series(estimated).values,
                 'Completion': completion_list,
             }
         )
@@ -1589,6 +1879,14 @@ def process_book_summary(df):
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def dataframe_to_csv(df):
+    """Encode a DataFrame as CSV bytes, reused while the same data is on screen"""
+    csv_buffer = io.BytesIO()
+    df.to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue()
+
+
 def get_most_recent_activity(df, card_name):
     """Get the most recent list/stage worked on for a specific card"""
     try:
@@ -1784,7 +2082,7 @@ def process_user_task_breakdown(df):
             aggregated['Date'] = 'N/A'
 
         # Format time spent
-        aggregated['Time Spent'] = aggregated['Time Spent (s)'].apply(format_seconds_to_time)
+        aggregated['Time Spent'] = format_seconds_series(aggregated['Time Spent (s)'])
 
         # Drop the seconds column as we now have formatted time
         aggregated = aggregated.drop('Time Spent (s)', axis=1)
@@ -1802,6 +2100,340 @@ def process_user_task_breakdown(df):
         return pd.DataFrame()
 
 
+def get_book_display_model(df, all_books_by_title, book_title):
+    """Return the cached display model for a book, keyed on a digest of its current rows"""
+    if not df.empty:
+        book_data = df[df['Card name'] == book_title]
+    else:
+        book_data = pd.DataFrame()
+    # The cache is shared between sessions, so key it on the rows themselves (including their
+    # completion flags) rather than on this session's write counter
+    row_hashes = pd.util.hash_pandas_object(book_data, index=False).to_numpy()
+    book_digest = hashlib.md5(row_hashes.tobytes()).hexdigest()
+    book_info = all_books_by_title.get(book_title)
+    return build_book_display_model(book_data, book_title, tuple(book_info) if book_info else None, book_digest)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def build_book_display_model(_book_data, book_title, book_info, book_digest):
+    """Build the progress summary shown in a book's expander, cached per digest of the book's rows"""
+    book_data = _book_data.copy()
+
+    # If book has no tasks, create empty data structure
+    if book_data.empty:
+        # Get book info from all_books
+        if book_info:
+            # Create minimal book data structure from the shared template
+            book_data = EMPTY_BOOK_TEMPLATE.assign(
+                **{
+                    'Card name': book_title,
+                    'Board': book_info[1] if book_info[1] else 'Not set',
+                    'Tag': book_info[2] if book_info[2] else None,
+                }
+            )
+
+    # Calculate overall progress using stage-based estimates
+    total_time_spent = np.nansum(book_data['Time spent (s)'].to_numpy(dtype=float, na_value=np.nan))
+
+    # Calculate total estimated time from the database entries
+    # Sum up all estimates stored in the database for this book
+    estimated_time = 0
+    if 'Card estimate(s)' in book_data.columns:
+        book_estimates = np.nansum(book_data['Card estimate(s)'].to_numpy(dtype=float, na_value=np.nan))
+        if book_estimates > 0:
+            estimated_time = book_estimates
+
+    # If no estimates in database, use reasonable defaults per stage
+    if estimated_time == 0:
+        unique_stages = book_data['List'].unique()
+        estimated_time = sum(DEFAULT_STAGE_ESTIMATES.get(stage, 3600) for stage in unique_stages)
+
+    # Calculate completion percentage for display
+    if estimated_time > 0:
+        completion_percentage = (total_time_spent / estimated_time) * 100
+        progress_text = f"{format_seconds_to_time(total_time_spent)}/{format_seconds_to_time(estimated_time)} ({completion_percentage:.1f}%)"
+    else:
+        completion_percentage = 0
+        progress_text = f"Total: {format_seconds_to_time(total_time_spent)} (No estimate)"
+
+    # Check if all tasks are completed (only if book has tasks)
+    all_tasks_completed = False
+    completion_emoji = ""
+    if not book_data.empty and book_data['List'].iloc[0] != 'No tasks assigned':
+        # Every non-archived row for the book is in book_data, so its completion flags decide this
+        all_tasks_completed = bool(book_data['Completed'].all())
+        completion_emoji = "✅ " if all_tasks_completed else ""
+
+    # Create book title with progress percentage
+    if estimated_time > 0:
+        if completion_percentage > 100:
+            over_percentage = completion_percentage - 100
+            book_title_with_progress = f"{completion_emoji}**{book_title}** ({over_percentage:.1f}% over estimate)"
+        else:
+            book_title_with_progress = f"{completion_emoji}**{book_title}** ({completion_percentage:.1f}%)"
+    else:
+        book_title_with_progress = f"{completion_emoji}**{book_title}** (No estimate)"
+
+    # Tags are stored per row but are the same for the whole book, so take the first one set
+    book_tag = None
+    if 'Tag' in book_data.columns:
+        book_tag = next((tag for tag in book_data['Tag'].to_numpy() if pd.notna(tag) and tag), None)
+
+    return {
+        'book_data': book_data,
+        'completion_percentage': completion_percentage,
+        'progress_text': progress_text,
+        'title': book_title_with_progress,
+        'tag': book_tag,
+    }
+
+
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def load_archived_books(_engine, archived_count, search=None):
+    """Get archived time per book/stage/user, optionally matching a title search; archived_count keys the cache"""
+    params = {}
+    search_filter = ''
+    if search:
+        search_filter = "AND card_name ILIKE :pattern ESCAPE '\\'"
+        params['pattern'] = like_substring_pattern(search)
+
+    # Books ordered by most recent activity
+    df_archived = pd.read_sql(
+        text(
+            f'''SELECT card_name as "Card name",
+           list_name as "List",
+           COALESCE(user_name, 'Not set') as "User",
+           SUM(time_spent_seconds) as "Time spent (s)",
+           SUM(card_estimate_seconds) as "Card estimate(s)"
+           FROM trello_time_tracking WHERE archived = TRUE {search_filter}
+           GROUP BY card_name, list_name, COALESCE(user_name, 'Not set')
+           ORDER BY MAX(MAX(created_at)) OVER (PARTITION BY card_name) DESC,
+                    card_name, list_name, 3'''
+        ),
+        _engine,
+        params=params,
+        dtype={'Time spent (s)': 'float64', 'Card estimate(s)': 'float64'},
+    )
+    # Stage and user names repeat across books, so store each distinct value once
+    return df_archived.astype({'List': 'category', 'User': 'category'})
+
+
+@st.fragment
+def render_reporting_tab(engine):
+    """Render the Reporting tab; its filter widgets rerun only this fragment"""
+    st.header("Reporting")
+    st.markdown("Filter tasks by user, book, board, tag, and date range from all uploaded data.")
+
+    # Get filter options from database
+    try:
+        users, books, boards, tags = get_filter_options(engine)
+    except Exception as e:
+        st.error(f"Error loading filter options: {str(e)}")
+        return
+
+    if not users:
+        st.info("No users found in database. Please add entries in the 'Add Book' tab first.")
+        st.stop()
+
+    # Filter selection - organized in columns
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # User selection dropdown
+        selected_user = st.selectbox(
+            "Select User:", options=["All Users"] + users, help="Choose a user to view their tasks"
+        )
+
+        # Book search input
+        book_search = st.text_input(
+            "Search Book (optional):",
+            placeholder="Start typing to search books...",
+            help="Type to search for a specific book",
+        )
+        # Match the search to available books; a single character would match most of the table
+        if len(book_search) >= 2:
+            try:
+                matched_books = get_books_matching(engine, book_search, BOOK_SEARCH_LIMIT)
+            except Exception as e:
+                st.error(f"Error searching books: {str(e)}")
+                matched_books = None
+            if matched_books:
+                if len(matched_books) > BOOK_SEARCH_LIMIT:
+                    matched_books = matched_books[:BOOK_SEARCH_LIMIT]
+                    st.caption(f"Showing the first {BOOK_SEARCH_LIMIT} matches; refine the search to narrow them down")
+                selected_book = st.selectbox(
+                    "Select from matches:", options=matched_books, help="Choose from matching books"
+                )
+            else:
+                if matched_books is not None:
+                    st.warning("No books found matching your search")
+                selected_book = "All Books"
+        else:
+            if book_search:
+                st.caption("Type at least 2 characters to search")
+            selected_book = "All Books"
+
+    with col2:
+        # Board selection dropdown
+        selected_board = st.selectbox(
+            "Select Board (optional):", options=["All Boards"] + boards, help="Choose a specific board to filter by"
+        )
+
+        # Tag selection dropdown
+        selected_tag = st.selectbox(
+            "Select Tag (optional):", options=["All Tags"] + tags, help="Choose a specific tag to filter by"
+        )
+
+    # Date range selection
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Start Date (optional):", value=None, help="Leave empty to include all dates")
+
+    with col2:
+        end_date = st.date_input("End Date (optional):", value=None, help="Leave empty to include all dates")
+
+    # Update button
+    update_button = st.button("Update Table", type="primary")
+
+    # Validate date range
+    if start_date and end_date and start_date > end_date:
+        st.error("Start date must be before end date")
+        return
+
+    # Filters (and this session's writes) behind the stored results. Repeat Updates with the same
+    # key reuse them for a short while; the TTL bounds how stale other users' changes can be
+    filter_key = (
+        selected_user,
+        selected_book,
+        selected_board,
+        selected_tag,
+        start_date,
+        end_date,
+        st.session_state.get('_data_version', 0),
+    )
+    results_fresh = (
+        filter_key == st.session_state.get('last_filter_key')
+        and time.monotonic() - st.session_state.get('last_filter_time', 0) < REPORT_RESULTS_TTL_SECONDS
+    )
+
+    # Filter and display results only when button is clicked or on initial load
+    if (update_button or 'filtered_tasks_displayed' not in st.session_state) and not results_fresh:
+        with st.spinner("Loading filtered tasks..."):
+            report_filters = {
+                'user_name': selected_user if selected_user != "All Users" else None,
+                'book_name': selected_book if selected_book != "All Books" else None,
+                'board_name': selected_board if selected_board != "All Boards" else None,
+                'tag_name': selected_tag if selected_tag != "All Tags" else None,
+                'start_date': start_date,
+                'end_date': end_date,
+            }
+            filtered_tasks = get_filtered_tasks_from_database(engine, **report_filters)
+
+        # Totals come from the same rows as the table, so the Summary always agrees with it
+        if filtered_tasks.empty:
+            filtered_summary = (0, 0, 0, 0)
+        else:
+            filtered_summary = (
+                filtered_tasks['Book Title'].nunique(),
+                len(filtered_tasks),
+                filtered_tasks['User'].nunique(),
+                int(filtered_tasks.pop('Time spent (s)').sum()),
+            )
+
+        # Store in session state to prevent automatic reloading
+        st.session_state.filtered_tasks_displayed = True
+        st.session_state.current_filtered_tasks = filtered_tasks
+        st.session_state.current_filtered_summary = filtered_summary
+        st.session_state.last_filter_key = filter_key
+        st.session_state.last_filter_time = time.monotonic()
+        st.session_state.current_filters = {
+            'user': selected_user,
+            'book': selected_book,
+            'board': selected_board,
+            'tag': selected_tag,
+            'start_date': start_date,
+            'end_date': end_date,
+        }
+
+    # Display cached results if available
+    if 'current_filtered_tasks' in st.session_state:
+
+        filtered_tasks = st.session_state.current_filtered_tasks
+        current_filters = st.session_state.get('current_filters', {})
+
+        if not filtered_tasks.empty:
+            st.subheader("Filtered Results")
+
+            # Show active filters info
+            active_filters = []
+            if current_filters.get('user') and current_filters.get('user') != "All Users":
+                active_filters.append(f"User: {current_filters.get('user')}")
+            if current_filters.get('book') and current_filters.get('book') != "All Books":
+                active_filters.append(f"Book: {current_filters.get('book')}")
+            if current_filters.get('board') and current_filters.get('board') != "All Boards":
+                active_filters.append(f"Board: {current_filters.get('board')}")
+            if current_filters.get('tag') and current_filters.get('tag') != "All Tags":
+                active_filters.append(f"Tag: {current_filters.get('tag')}")
+            if current_filters.get('start_date') or current_filters.get('end_date'):
+                start_str = (
+                    current_filters.get('start_date').strftime('%d/%m/%Y')
+                    if current_filters.get('start_date')
+                    else 'All'
+                )
+                end_str = (
+                    current_filters.get('end_date').strftime('%d/%m/%Y')
+                    if current_filters.get('end_date')
+                    else 'All'
+                )
+                active_filters.append(f"Date range: {start_str} to {end_str}")
+
+            if active_filters:
+                left_col, right_col = st.columns([1, 3])
+                with left_col:
+                    with st.expander("Active Filters", expanded=False):
+                        for f in active_filters:
+                            st.write(f)
+                with right_col:
+                    st.dataframe(filtered_tasks, use_container_width=True, hide_index=True)
+            else:
+                st.dataframe(filtered_tasks, use_container_width=True, hide_index=True)
+
+            # Download button for filtered results
+            st.download_button(
+                label="Download Filtered Results",
+                data=dataframe_to_csv(filtered_tasks),
+                file_name="filtered_tasks.csv",
+                mime="text/csv",
+            )
+
+            # Summary statistics for filtered data
+            st.subheader("Summary")
+            col1, col2, col3, col4 = st.columns(4)
+
+            total_books, total_tasks, unique_users, total_seconds = st.session_state.get(
+                'current_filtered_summary', (0, 0, 0, 0)
+            )
+
+            with col1:
+                st.metric("Total Books", total_books)
+
+            with col2:
+                st.metric("Total Tasks", total_tasks)
+
+            with col3:
+                st.metric("Unique Users", unique_users)
+
+            with col4:
+                total_hours = total_seconds / 3600
+                st.metric("Total Time (Hours)", f"{total_hours:.1f}")
+
+        else:
+            st.warning("No tasks found matching the selected filters.")
+
+    elif 'filtered_tasks_displayed' not in st.session_state:
+        st.info("Click 'Update Table' to load filtered results.")
+
+
 def main():
     # Initialise database connection
     engine = init_database()
@@ -1824,7 +2456,12 @@ def main():
     if 'timer_accumulated_time' not in st.session_state:
         st.session_state.timer_accumulated_time = {}
     if 'timer_session_counts' not in st.session_state:
-        st.session_state.timer_session_counts = {}
+        st.session_state.timer_session_counts = Counter()
+    if 'flash_messages' not in st.session_state:
+        # Bounded so unshown messages can't accumulate for the whole session
+        st.session_state.flash_messages = deque(maxlen=32)
+    if '_keys_by_book_stage' not in st.session_state:
+        st.session_state['_keys_by_book_stage'] = {}
 
     # Recover any emergency saved times from previous session
     recover_emergency_saved_times(engine)
@@ -1980,22 +2617,9 @@ def main():
             "*Assign users to stages and set time estimates. You don't need to assign a user; that can be done later. Time should be added in hh:mm or decimal format. E.g. 1 hour and 30 minutes can be expressed as 1:30, 01:30 or 1.5.*"
         )
 
-        # Define user groups for different types of work (alphabetically ordered)
-        editorial_users = [
-            "Not set",
-            "Bethany Latham",
-            "Charis Mather",
-            "Noah Leatherland",
-        ]
-        design_users = [
-            "Not set",
-            "Amelia Harris",
-            "Amy Li",
-            "Drue Rintoul",
-            "Jasmine Pointer",
-            "Ker Ker Lee",
-            "Rob Delph",
-        ]
+        # User groups for different types of work (alphabetically ordered)
+        editorial_users = EDITORIAL_USER_OPTIONS
+        design_users = DESIGN_USER_OPTIONS
 
         # Time tracking fields with specific user groups
         time_fields = [
@@ -2119,6 +2743,7 @@ def main():
                             entries_added += 1
 
                         conn.commit()
+                        bump_data_version()
 
                     # Keep user on the Add Book tab
 
@@ -2176,6 +2801,23 @@ def main():
         )
         st.markdown("Visual progress tracking for all books with individual task timers.")
 
+        # Hide the submit button and form styling of the manual time entry forms
+        st.markdown(
+            """
+            <style>
+            div[class*="st-key-manual_time_"] div[data-testid="stForm"] button {
+                display: none;
+            }
+            div[class*="st-key-manual_time_"] div[data-testid="stForm"] {
+                border: none !important;
+                background: none !important;
+                padding: 0 !important;
+            }
+            </style>
+            """,
+            unsafe_allow_html=True,
+        )
+
 
         # Check if we have data from database with SSL connection retry
         total_records = 0
@@ -2199,17 +2841,19 @@ def main():
 
         try:
             # Clear pending refresh state at start of render
-            if 'pending_refresh' in st.session_state:
-                del st.session_state.pending_refresh
+            st.session_state.pop('pending_refresh', None)
 
             # Initialize variables to avoid UnboundLocalError
             df_from_db = None
             all_books = []
+            all_books_by_title = {}
 
             if total_records and total_records > 0:
 
                 # Get all books including those without tasks
                 all_books = get_all_books(engine)
+                # Index by title once; reversed so the first row for a title wins, as the old scans did
+                all_books_by_title = {book[0]: book for book in reversed(all_books)}
 
                 # Get task data from database for book completion (exclude archived)
                 df_from_db = pd.read_sql(
@@ -2219,7 +2863,8 @@ def main():
                        time_spent_seconds as "Time spent (s)",
                        date_started as "Date started (f)",
                        card_estimate_seconds as "Card estimate(s)",
-                       board_name as "Board", created_at, tag as "Tag"
+                       board_name as "Board", created_at, tag as "Tag",
+                       COALESCE(completed, FALSE) as "Completed"
                        FROM trello_time_tracking WHERE archived = FALSE ORDER BY created_at DESC''',
                     engine,
                 )
@@ -2264,10 +2909,18 @@ def main():
                         # Show all books by default
                         books_to_display = sorted(book[0] for book in all_books)
 
+                    # Bind the timer state dicts once; they are the same objects held in session state
+                    timers = st.session_state.timers
+                    timer_start_times = st.session_state.timer_start_times
+                    timer_accumulated_time = st.session_state.timer_accumulated_time
+                    timer_paused = st.session_state.timer_paused
+                    timer_session_counts = st.session_state.timer_session_counts
+                    now_bst = datetime.now(BST)
+                    now_ts = now_bst.timestamp()
+
                     # Pagination setup
                     books_per_page = 10
-                    if 'book_page' not in st.session_state:
-                        st.session_state.book_page = 0
+                    st.session_state.setdefault('book_page', 0)
 
                     # Reset to first page if search changes
                     prev_search = st.session_state.get('prev_completion_search')
@@ -2280,141 +2933,64 @@ def main():
                     end_idx = start_idx + books_per_page
                     books_subset = books_to_display[start_idx:end_idx]
 
+                    # Books with running timers on other pages get a compact row instead of a full card
+                    # Index running timers by book once instead of scanning every timer per book/stage
+                    running_timers_by_book = {}
+                    for timer_key, active in timers.items():
+                        if active:
+                            running_timers_by_book.setdefault('_'.join(timer_key.split('_')[:-2]), []).append(
+                                timer_key
+                            )
+                    running_timer_books = running_timers_by_book.keys()
+                    off_page_positions = {
+                        title: position
+                        for position, title in enumerate(books_to_display)
+                        if title in running_timer_books and not start_idx <= position < end_idx
+                    }
+                    for book_title, position in off_page_positions.items():
+                        model = get_book_display_model(filtered_df, all_books_by_title, book_title)
+                        st.markdown(
+                            f"⏱️ {model['title']} - timer running (page {position // books_per_page + 1})"
+                        )
+
                     # Only display books if we have search results
                     if books_subset:
+                        # Look up addable stages for every book on this page in one query
+                        available_stages_by_book = get_available_stages_for_books(engine, books_subset)
+
                         # Display each book with enhanced visualization
                         for book_title in books_subset:
-                            # Check if book has tasks
-                            if not filtered_df.empty:
-                                book_mask = filtered_df['Card name'] == book_title
-                                book_data = filtered_df[book_mask].copy()
-                            else:
-                                book_data = pd.DataFrame()
-
-                            # Debug: Let's see what we have
-                            # st.write(f"DEBUG: Book '{book_title}' - book_data shape: {book_data.shape}")
-                            # if not book_data.empty:
-                            #     st.write(f"DEBUG: Book tasks found: {book_data['List'].unique()}")
-                            # else:
-                            #     st.write(f"DEBUG: Book data is empty for '{book_title}'")
-
-                            # If book has no tasks, create empty data structure
-                            if book_data.empty:
-                                # Get book info from all_books
-                                book_info = next((book for book in all_books if book[0] == book_title), None)
-                                if book_info:
-                                    # Create minimal book data structure
-                                    book_data = pd.DataFrame(
-                                        {
-                                            'Card name': [book_title],
-                                            'User': ['Not set'],
-                                            'List': ['No tasks assigned'],
-                                            'Time spent (s)': [0],
-                                            'Date started (f)': [None],
-                                            'Card estimate(s)': [0],
-                                            'Board': [book_info[1] if book_info[1] else 'Not set'],
-                                            'Tag': [book_info[2] if book_info[2] else None],
-                                        }
-                                    )
-
-                            # Calculate overall progress using stage-based estimates
-                            total_time_spent = book_data['Time spent (s)'].sum()
-
-                            # Calculate total estimated time from the database entries
-                            # Sum up all estimates stored in the database for this book
-                            estimated_time = 0
-                            if 'Card estimate(s)' in book_data.columns:
-                                book_estimates = book_data['Card estimate(s)'].fillna(0).sum()
-                                if book_estimates > 0:
-                                    estimated_time = book_estimates
-
-                            # If no estimates in database, use reasonable defaults per stage
-                            if estimated_time == 0:
-                                default_stage_estimates = {
-                                    'Editorial R&D': 2 * 3600,  # 2 hours default
-                                    'Editorial Writing': 8 * 3600,  # 8 hours default
-                                    '1st Edit': 4 * 3600,  # 4 hours default
-                                    '2nd Edit': 2 * 3600,  # 2 hours default
-                                    'Design R&D': 3 * 3600,  # 3 hours default
-                                    'In Design': 6 * 3600,  # 6 hours default
-                                    '1st Proof': 2 * 3600,  # 2 hours default
-                                    '2nd Proof': 1.5 * 3600,  # 1.5 hours default
-                                    'Editorial Sign Off': 0.5 * 3600,  # 30 minutes default
-                                    'Design Sign Off': 0.5 * 3600,  # 30 minutes default
-                                }
-                                unique_stages = book_data['List'].unique()
-                                estimated_time = sum(
-                                    default_stage_estimates.get(stage, 3600) for stage in unique_stages
-                                )
-
-                            # Calculate completion percentage for display
-                            if estimated_time > 0:
-                                completion_percentage = (total_time_spent / estimated_time) * 100
-                                progress_text = f"{format_seconds_to_time(total_time_spent)}/{format_seconds_to_time(estimated_time)} ({completion_percentage:.1f}%)"
-                            else:
-                                completion_percentage = 0
-                                progress_text = f"Total: {format_seconds_to_time(total_time_spent)} (No estimate)"
+                            # Cached per book; the key changes whenever the book's rows do
+                            model = get_book_display_model(filtered_df, all_books_by_title, book_title)
+                            book_data = model['book_data']
+                            completion_percentage = model['completion_percentage']
+                            progress_text = model['progress_text']
+                            book_title_with_progress = model['title']
 
                             # Check for active timers more efficiently
-                            has_active_timer = any(
-                                timer_key.startswith(f"{book_title}_") and active
-                                for timer_key, active in st.session_state.timers.items()
-                            )
-
-                            # Check if all tasks are completed (only if book has tasks)
-                            all_tasks_completed = False
-                            completion_emoji = ""
-                            if not book_data.empty and book_data['List'].iloc[0] != 'No tasks assigned':
-                                # Check completion status from database
-                                all_tasks_completed = check_all_tasks_completed(engine, book_title)
-                                completion_emoji = "✅ " if all_tasks_completed else ""
-
-                            # Create book title with progress percentage
-                            if estimated_time > 0:
-                                if completion_percentage > 100:
-                                    over_percentage = completion_percentage - 100
-                                    book_title_with_progress = (
-                                        f"{completion_emoji}**{book_title}** ({over_percentage:.1f}% over estimate)"
-                                    )
-                                else:
-                                    book_title_with_progress = (
-                                        f"{completion_emoji}**{book_title}** ({completion_percentage:.1f}%)"
-                                    )
-                            else:
-                                book_title_with_progress = f"{completion_emoji}**{book_title}** (No estimate)"
+                            book_running_timers = running_timers_by_book.get(book_title, [])
+                            has_active_timer = bool(book_running_timers)
 
                             # Check if book should be expanded (either has active timer or was manually expanded)
                             expanded_key = f"expanded_{book_title}"
-                            if expanded_key not in st.session_state:
-                                st.session_state[expanded_key] = has_active_timer
-
-                            with st.expander(book_title_with_progress, expanded=st.session_state[expanded_key]):
-                                # Show progress bar and completion info at the top
-                                progress_bar_html = f"""
-                                    <div style="width: 50%; background-color: #f0f0f0; border-radius: 5px; height: 10px; margin: 8px 0;">
-                                    <div style="width: {min(completion_percentage, 100):.1f}%; background-color: #2AA395; height: 100%; border-radius: 5px;"></div>
-                                    </div>
-                                    """
-                                st.markdown(progress_bar_html, unsafe_allow_html=True)
-                                st.markdown(
-                                    f'<div style="font-size: 14px; color: #666; margin-bottom: 10px;">{progress_text}</div>',
-                                    unsafe_allow_html=True,
-                                )
+                            with st.expander(
+                                book_title_with_progress, expanded=st.session_state.setdefault(expanded_key, has_active_timer)
+                            ):
+                                # Show progress bar, completion info and tags at the top in a single element
+                                header_html = PROGRESS_BAR_TEMPLATE.format(
+                                    pct=min(completion_percentage, 100)
+                                ) + PROGRESS_TEXT_TEMPLATE.format(text=progress_text)
 
                                 # Display tag if available
-                                book_tags = book_data['Tag'].dropna().unique()
-                                if len(book_tags) > 0 and book_tags[0]:
+                                if model['tag']:
                                     # Handle multiple tags (comma-separated)
-                                    tag_display = book_tags[0]
+                                    tag_display = model['tag']
                                     # If there are commas, it means multiple tags
                                     if ',' in tag_display:
                                         tag_display = tag_display.replace(',', ', ')  # Ensure proper spacing
-                                    st.markdown(
-                                        f'<div style="font-size: 14px; color: #888; margin-bottom: 10px;"><strong>Tags:</strong> {tag_display}</div>',
-                                        unsafe_allow_html=True,
-                                    )
+                                    header_html += TAG_TEMPLATE.format(tags=tag_display)
 
-                                st.markdown("---")
+                                st.markdown(header_html + "<hr>", unsafe_allow_html=True)
 
                                 # Define the order of stages to match the actual data entry form
                                 stage_order = [
@@ -2431,33 +3007,36 @@ def main():
                                 ]
 
                                 # Group by stage/list and aggregate by user
-                                stages_grouped = book_data.groupby('List')
+                                stages_grouped = book_data.groupby('List', observed=True, sort=False)
 
                                 # Display stages in accordion style (each stage as its own expander)
                                 stage_counter = 0
                                 for stage_name in stage_order:
-                                    if stage_name in stages_grouped.groups:
+                                    if stage_name in stages_grouped.indices:
                                         stage_data = stages_grouped.get_group(stage_name)
+                                        # First record per user, used for board/tag lookups when saving time
+                                        user_rows = (
+                                            stage_data.drop_duplicates('User')
+                                            .set_index('User', drop=False)
+                                            .to_dict('index')
+                                        )
 
                                         # Check if this stage has any active timers (efficient lookup)
                                         stage_has_active_timer = any(
-                                            timer_key.startswith(f"{book_title}_{stage_name}_") and active
-                                            for timer_key, active in st.session_state.timers.items()
+                                            timer_key.startswith(f"{book_title}_{stage_name}_")
+                                            for timer_key in book_running_timers
                                         )
 
                                         # Aggregate time by user for this stage
                                         user_aggregated = (
-                                            stage_data.groupby('User')['Time spent (s)'].sum().reset_index()
+                                            stage_data.groupby('User', observed=True)['Time spent (s)'].sum().reset_index()
                                         )
 
                                         # Create a summary for the expander title showing all users and their progress
                                         stage_summary_parts = []
-                                        summary_users = set()
+                                        per_user_completion = {}
                                         for idx, user_task in user_aggregated.iterrows():
                                             user_name = user_task['User']
-                                            if user_name in summary_users:
-                                                continue
-                                            summary_users.add(user_name)
                                             actual_time = user_task['Time spent (s)']
 
                                             # Get estimated time from the database for this specific user/stage combination
@@ -2478,6 +3057,7 @@ def main():
                                             task_completed = get_task_completion(
                                                 engine, book_title, user_name, stage_name
                                             )
+                                            per_user_completion[user_name] = task_completed
                                             completion_emoji = "✅ " if task_completed else ""
 
                                             # Format times for display
@@ -2499,21 +3079,17 @@ def main():
 
                                         # Check if stage should be expanded (either has active timer or was manually expanded)
                                         stage_expanded_key = f"stage_expanded_{book_title}_{stage_name}"
-                                        if stage_expanded_key not in st.session_state:
-                                            st.session_state[stage_expanded_key] = stage_has_active_timer
-
-                                        with st.expander(expander_title, expanded=st.session_state[stage_expanded_key]):
-                                            processed_tasks = set()
-                                            # Show one task per user for this stage
+                                        with st.expander(
+                                            expander_title, expanded=st.session_state.setdefault(stage_expanded_key, stage_has_active_timer)
+                                        ):
+                                            # Show one task per user for this stage (groupby gives one row per user)
                                             for idx, user_task in user_aggregated.iterrows():
                                                 user_name = user_task['User']
-                                                task_key = f"{book_title}_{stage_name}_{user_name}"
-                                                if task_key in processed_tasks:
-                                                    continue
-                                                processed_tasks.add(task_key)
                                                 actual_time = user_task['Time spent (s)']
                                                 task_key = f"{book_title}_{stage_name}_{user_name}"
-                                                session_id = st.session_state.get('timer_session_counts', {}).get(task_key, 0)
+                                                # Short stable suffix for widget keys instead of the raw title/stage/user string
+                                                task_hash = stable_hash(task_key)
+                                                session_id = timer_session_counts.get(task_key, 0)
 
                                                 # Get estimated time from the database for this specific user/stage combination
                                                 user_stage_data = stage_data[stage_data['User'] == user_name]
@@ -2537,31 +3113,11 @@ def main():
                                                     current_user = user_name if user_name else "Not set"
 
                                                     # Determine user options based on stage type
-                                                    if stage_name in [
-                                                        "Editorial R&D",
-                                                        "Editorial Writing",
-                                                        "1st Edit",
-                                                        "2nd Edit",
-                                                        "1st Proof",
-                                                        "2nd Proof",
-                                                        "Editorial Sign Off",
-                                                    ]:
-                                                        user_options = [
-                                                            "Not set",
-                                                            "Bethany Latham",
-                                                            "Charis Mather",
-                                                            "Noah Leatherland",
-                                                        ]
-                                                    else:  # Design stages
-                                                        user_options = [
-                                                            "Not set",
-                                                            "Amelia Harris",
-                                                            "Amy Li",
-                                                            "Drue Rintoul",
-                                                            "Jasmine Pointer",
-                                                            "Ker Ker Lee",
-                                                            "Rob Delph",
-                                                        ]
+                                                    user_options = (
+                                                        EDITORIAL_USER_OPTIONS
+                                                        if stage_name in EDITORIAL_STAGES
+                                                        else DESIGN_USER_OPTIONS
+                                                    )
 
                                                     # Find current user index
                                                     try:
@@ -2569,12 +3125,6 @@ def main():
                                                     except ValueError:
                                                         current_index = 0  # Default to "Not set"
 
-                                                    import hashlib
-
-                                                    def stable_hash(*values) -> str:
-                                                        s = "||".join("" if v is None else str(v) for v in values)
-                                                        return hashlib.md5(s.encode()).hexdigest()[:8]
-
                                                     session_id = stable_hash(book_title, stage_name, user_name, str(idx))
                                                     key_prefix = f"reassign_{session_id}"
                                                     st.button("Reassign", key=f"{key_prefix}_btn")
@@ -2615,16 +3165,13 @@ def main():
                                                                 f"Time: {time_spent_formatted} / {estimated_formatted}"
                                                             )
 
-                                                            # Completion checkbox - always get fresh status from database
-                                                            completion_key = (
-                                                                f"complete_{book_title}_{stage_name}_{user_name}"
-                                                            )
-                                                            current_completion_status = get_task_completion(
-                                                                engine, book_title, user_name, stage_name
-                                                            )
+                                                            # Completion checkbox - status was read from the database for the stage summary
+                                                            completion_key = f"complete_{task_key}"
+                                                            current_completion_status = per_user_completion[user_name]
 
                                                             # Update session state with database value
                                                             st.session_state[completion_key] = current_completion_status
+                                                            track_book_stage_key(book_title, stage_name, completion_key)
 
                                                             new_completion_status = st.checkbox(
                                                                 "Completed",
@@ -2646,17 +3193,15 @@ def main():
 
                                                                 # Clear any cached completion status to force refresh
                                                                 completion_cache_key = f"book_completion_{book_title}"
-                                                                if completion_cache_key in st.session_state:
-                                                                    del st.session_state[completion_cache_key]
+                                                                st.session_state.pop(completion_cache_key, None)
 
                                                                 # Store success message for display without immediate refresh
-                                                                success_msg_key = f"completion_success_{task_key}"
                                                                 status_text = (
                                                                     "✅ Marked as completed"
                                                                     if new_completion_status
                                                                     else "❌ Marked as incomplete"
                                                                 )
-                                                                st.session_state[success_msg_key] = status_text
+                                                                add_flash_message(task_key, status_text)
 
                                                                 # Set flag for book-level completion update
                                                                 st.session_state['completion_changed'] = True
@@ -2693,21 +3238,19 @@ def main():
                                                                     },
                                                                 )
                                                                 conn.commit()
+                                                                bump_data_version()
 
                                                                 # Clear relevant session state to force refresh
-                                                                keys_to_clear = [
-                                                                    k
-                                                                    for k in st.session_state.keys()
-                                                                    if book_title in k and stage_name in k
-                                                                ]
+                                                                keys_to_clear = st.session_state[
+                                                                    '_keys_by_book_stage'
+                                                                ].pop((book_title, stage_name), ())
                                                                 for key in keys_to_clear:
                                                                     if key.startswith(('complete_', 'timer_')):
-                                                                        del st.session_state[key]
+                                                                        st.session_state.pop(key, None)
 
                                                                 # Store success message instead of immediate refresh
-                                                                success_key = f"reassign_success_{book_title}_{stage_name}_{user_name}_{session_id}_{idx}"
-                                                                st.session_state[success_key] = (
-                                                                    f"User reassigned from {current_user} to {new_user}"
+                                                                add_flash_message(
+                                                                    task_key, f"User reassigned from {current_user} to {new_user}"
                                                                 )
 
                                                                 # User reassignment completed
@@ -2720,36 +3263,43 @@ def main():
 
                                         with col3:
                                             # Start/Stop timer button with timer display
-                                            if task_key not in st.session_state.timers:
-                                                st.session_state.timers[task_key] = False
+                                            if task_key not in timers:
+                                                timers[task_key] = False
 
                                             # Timer controls and display
-                                            if st.session_state.timers[task_key]:
+                                            if timers[task_key]:
                                                 # Timer is active - show simple stop control
-                                                if task_key in st.session_state.timer_start_times:
+                                                if task_key in timer_start_times:
 
                                                     # Simple timer calculation
-                                                    start_time = st.session_state.timer_start_times[task_key]
-                                                    accumulated = st.session_state.timer_accumulated_time.get(task_key, 0)
-                                                    paused = st.session_state.timer_paused.get(task_key, False)
+                                                    start_time = timer_start_times[task_key]
+                                                    accumulated = timer_accumulated_time.get(task_key, 0)
+                                                    paused = timer_paused.get(task_key, False)
 
-                                                    current_elapsed = 0 if paused else calculate_timer_elapsed_time(start_time)
+                                                    # Session start times are timezone-aware, so compare timestamps directly
+                                                    current_elapsed = (
+                                                        0 if paused else max(0, int(now_ts - start_time.timestamp()))
+                                                    )
                                                     elapsed_seconds = accumulated + current_elapsed
                                                     elapsed_str = format_seconds_to_time(elapsed_seconds)
 
-                                                    # Display recording status with a client-side timer
+                                                    # Display recording status with a client-side timer; the browser
+                                                    # ticks it, so no rerun is needed to update the elapsed time
                                                     status_label = "Paused" if paused else "Recording"
-                                                    timer_id = f"timer_{task_key}_{session_id}"
-                                                    components.html(
-                                                        render_basic_js_timer(
-                                                            timer_id,
-                                                            status_label,
-                                                            elapsed_seconds,
-                                                            paused,
-                                                        ),
-                                                        height=40,
-
-                                                    )
+                                                    if paused:
+                                                        # A paused timer doesn't tick, so skip the iframe
+                                                        st.markdown(f"**{status_label}** ({elapsed_str})")
+                                                    else:
+                                                        timer_id = f"timer_{task_hash}_{session_id}"
+                                                        components.html(
+                                                            render_basic_js_timer(
+                                                                timer_id,
+                                                                status_label,
+                                                                elapsed_seconds,
+                                                                paused,
+                                                            ),
+                                                            height=40,
+                                                        )
 
                                                     # Second row with pause and stop controls
                                                     timer_row2_col1, timer_row2_col2 = st.columns([1.5, 1])
@@ -2759,12 +3309,12 @@ def main():
 
                                                         if st.button(
                                                             pause_label,
-                                                            key=f"pause_{task_key}_{session_id}",
+                                                            key=f"pause_{task_hash}_{session_id}",
                                                         ):
                                                             if paused:
-                                                                resume_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(BST)
-                                                                st.session_state.timer_start_times[task_key] = resume_time
-                                                                st.session_state.timer_paused[task_key] = False
+                                                                resume_time = now_bst
+                                                                timer_start_times[task_key] = resume_time
+                                                                timer_paused[task_key] = False
                                                                 update_active_timer_state(
                                                                     engine,
                                                                     task_key,
@@ -2773,10 +3323,12 @@ def main():
                                                                     resume_time,
                                                                 )
                                                             else:
-                                                                elapsed_since_start = calculate_timer_elapsed_time(start_time)
+                                                                elapsed_since_start = max(
+                                                                    0, int(now_ts - start_time.timestamp())
+                                                                )
                                                                 new_accum = accumulated + elapsed_since_start
-                                                                st.session_state.timer_accumulated_time[task_key] = new_accum
-                                                                st.session_state.timer_paused[task_key] = True
+                                                                timer_accumulated_time[task_key] = new_accum
+                                                                timer_paused[task_key] = True
                                                                 update_active_timer_state(
                                                                     engine,
                                                                     task_key,
@@ -2786,150 +3338,32 @@ def main():
                                                             st.rerun()
 
                                                     with timer_row2_col2:
-                                                        if st.button("Stop", key=f"stop_{task_key}_{session_id}"):
-                                                            final_time = elapsed_seconds
-                                                            stop_active_timer(engine, task_key)
-
-                                                            # Keep expanded states
-                                                            expanded_key = f"expanded_{book_title}"
+                                                        if st.button("Stop", key=f"stop_{task_hash}_{session_id}"):
+                                                            # Keep expanded states; stop_active_timer reruns the script
                                                             st.session_state[expanded_key] = True
-                                                            stage_expanded_key = (
-                                                                f"stage_expanded_{book_title}_{stage_name}"
-                                                            )
                                                             st.session_state[stage_expanded_key] = True
-
-                                                            # Always clear timer states first to prevent double-processing
-                                                            st.session_state.timers[task_key] = False
-                                                            timer_start_time = st.session_state.timer_start_times.get(
-                                                                task_key
+                                                            stop_active_timer(
+                                                                engine, task_key, tag=user_rows[user_name].get('Tag')
                                                             )
 
-                                                            # Save to database only if time > 0
-                                                            if final_time > 0 and timer_start_time:
-                                                                try:
-                                                                    user_original_data = stage_data[
-                                                                        stage_data['User'] == user_name
-                                                                    ].iloc[0]
-                                                                    board_name = user_original_data['Board']
-                                                                    existing_tag = (
-                                                                        user_original_data.get('Tag', None)
-                                                                        if 'Tag' in user_original_data
-                                                                        else None
-                                                                    )
-
-                                                                    with engine.connect() as conn:
-                                                                        # Use ON CONFLICT to handle duplicate entries by updating existing records
-                                                                        conn.execute(
-                                                                            text(
-                                                                                '''
-                                            INSERT INTO trello_time_tracking
-                                            (card_name, user_name, list_name, time_spent_seconds,
-                                             date_started, session_start_time, board_name, tag)
-                                            VALUES (:card_name, :user_name, :list_name, :time_spent_seconds,
-                                                   :date_started, :session_start_time, :board_name, :tag)
-                                            ON CONFLICT (card_name, user_name, list_name, date_started, time_spent_seconds)
-                                            DO UPDATE SET
-                                                session_start_time = EXCLUDED.session_start_time,
-                                                board_name = EXCLUDED.board_name,
-                                                tag = EXCLUDED.tag,
-                                                created_at = CURRENT_TIMESTAMP
-                                        '''
-                                                                            ),
-                                                                            {
-                                                                                'card_name': book_title,
-                                                                                'user_name': user_name,
-                                                                                'list_name': stage_name,
-                                                                                'time_spent_seconds': final_time,
-                                                                                'date_started': timer_start_time.date(),
-                                                                                'session_start_time': timer_start_time,
-                                                                                'board_name': board_name,
-                                                                                'tag': existing_tag,
-                                                                            },
-                                                                        )
-
-                                                                        # Remove from active timers
-                                                                        conn.execute(
-                                                                            text(
-                                                                                'DELETE FROM active_timers WHERE timer_key = :timer_key'
-                                                                            ),
-                                                                            {'timer_key': task_key},
-                                                                        )
-                                                                        conn.commit()
-
-                                                                    # Store success message for display at bottom
-                                                                    success_msg_key = f"timer_success_{task_key}"
-                                                                    st.session_state[success_msg_key] = (
-                                                                        f"Added {elapsed_str} to {book_title} - {stage_name}"
-                                                                    )
-
-                                                                    # Timer stopped successfully
-                                                                except Exception as e:
-                                                                    st.error(f"Error saving timer data: {str(e)}")
-                                                                    # Still try to clean up active timer from database on error
-                                                                    try:
-                                                                        with engine.connect() as conn:
-                                                                            conn.execute(
-                                                                                text(
-                                                                                    'DELETE FROM active_timers WHERE timer_key = :timer_key'
-                                                                                ),
-                                                                                {'timer_key': task_key},
-                                                                            )
-                                                                            conn.commit()
-                                                                    except:
-                                                                        pass  # Ignore cleanup errors
-                                                            else:
-                                                                # Even if no time to save, clean up active timer
-                                                                try:
-                                                                    with engine.connect() as conn:
-                                                                        conn.execute(
-                                                                            text(
-                                                                                'DELETE FROM active_timers WHERE timer_key = :timer_key'
-                                                                            ),
-                                                                            {'timer_key': task_key},
-                                                                        )
-                                                                        conn.commit()
-                                                                except:
-                                                                    pass  # Ignore cleanup errors
-
-                                                            # Clear timer states
-                                                            st.session_state.setdefault('timer_session_counts', {})
-                                                            st.session_state.timer_session_counts[task_key] = (
-                                                                st.session_state.timer_session_counts.get(task_key, 0) + 1
-                                                            )
-                                                            if task_key in st.session_state.timer_start_times:
-                                                                del st.session_state.timer_start_times[task_key]
-                                                            if task_key in st.session_state.timer_accumulated_time:
-                                                                del st.session_state.timer_accumulated_time[task_key]
-                                                            if task_key in st.session_state.timer_paused:
-                                                                del st.session_state.timer_paused[task_key]
-
-                                                            # Refresh the interface so totals update immediately
-                                                            st.rerun()
-
                                             else:
                                                 # Timer is not active - show Start button
-                                                if st.button("Start", key=f"start_{task_key}_{session_id}"):
+                                                if st.button("Start", key=f"start_{task_hash}_{session_id}"):
                                                     # Preserve expanded state before rerun
-                                                    expanded_key = f"expanded_{book_title}"
                                                     st.session_state[expanded_key] = True
 
                                                     # Also preserve stage expanded state
-                                                    stage_expanded_key = f"stage_expanded_{book_title}_{stage_name}"
                                                     st.session_state[stage_expanded_key] = True
 
-                                                    # Start timer - use UTC for consistency
-                                                    start_time_utc = datetime.utcnow().replace(tzinfo=timezone.utc)
-                                                    # Convert to BST for display/storage but keep UTC calculation base
-                                                    start_time_bst = start_time_utc.astimezone(BST)
-                                                    st.session_state.timers[task_key] = True
-                                                    st.session_state.timer_start_times[task_key] = start_time_bst
-                                                    st.session_state.timer_paused[task_key] = False
-                                                    st.session_state.timer_accumulated_time[task_key] = 0
+                                                    # Start timer - timezone-aware, so elapsed time is still calculated in UTC
+                                                    start_time_bst = now_bst
+                                                    timers[task_key] = True
+                                                    timer_start_times[task_key] = start_time_bst
+                                                    timer_paused[task_key] = False
+                                                    timer_accumulated_time[task_key] = 0
 
                                                     # Save to database for persistence
-                                                    user_original_data = stage_data[
-                                                        stage_data['User'] == user_name
-                                                    ].iloc[0]
+                                                    user_original_data = user_rows[user_name]
                                                     board_name = user_original_data['Board']
 
                                                     save_active_timer(
@@ -2949,171 +3383,82 @@ def main():
                                             # Manual time entry section
                                             st.write("**Manual Entry:**")
 
-                                            # Create a form to handle Enter key properly
-                                            with st.form(key=f"time_form_{task_key}_{session_id}"):
-                                                manual_time = st.text_input(
-                                                    "Add time (hh:mm:ss):", placeholder="01:30:00"
-                                                )
-
-                                                # Hide the submit button and form styling with CSS
-                                                st.markdown(
-                                                    """
-                                                    <style>
-                                                    div[data-testid="stForm"] button {
-                                                        display: none;
-                                                    }
-                                                    div[data-testid="stForm"] {
-                                                        border: none !important;
-                                                        background: none !important;
-                                                        padding: 0 !important;
-                                                    }
-                                                    </style>
-                                                    """,
-                                                    unsafe_allow_html=True,
-                                                )
-
-                                                submitted = st.form_submit_button("Add Time")
-
-                                                if submitted and manual_time:
-                                                    try:
-                                                        # Parse the time format hh:mm:ss
-                                                        time_parts = manual_time.split(':')
-                                                        if len(time_parts) == 3:
-                                                            hours = int(time_parts[0])
-                                                            minutes = int(time_parts[1])
-                                                            seconds = int(time_parts[2])
-
-                                                            # Validate individual components
-                                                            if hours > 100:
-                                                                st.error(
-                                                                    f"Maximum hours allowed is 100. You entered {hours} hours."
-                                                                )
-                                                            elif minutes >= 60:
-                                                                st.error(
-                                                                    f"Minutes must be less than 60. You entered {minutes} minutes."
+                                            # Keyed container gives the form a CSS class to hide its submit button
+                                            with st.container(key=f"manual_time_{task_hash}_{session_id}"):
+                                                # Create a form to handle Enter key properly
+                                                with st.form(key=f"time_form_{task_hash}_{session_id}"):
+                                                    manual_time = st.text_input(
+                                                        "Add time (hh:mm:ss):", placeholder="01:30:00"
+                                                    )
+
+                                                    submitted = st.form_submit_button("Add Time")
+
+                                                    if submitted and manual_time:
+                                                        total_seconds, parse_error = parse_manual_time(manual_time)
+                                                        if parse_error:
+                                                            st.error(parse_error)
+                                                        else:
+                                                            # Add manual time to database
+                                                            try:
+                                                                # Get board name from original data
+                                                                user_original_data = user_rows[user_name]
+                                                                board_name = user_original_data['Board']
+                                                                # Get existing tag from original data
+                                                                existing_tag = user_original_data.get('Tag')
+
+                                                                # Get current completion status to preserve it
+                                                                completion_key = f"complete_{task_key}"
+                                                                current_completion = get_task_completion(
+                                                                    engine, book_title, user_name, stage_name
                                                                 )
-                                                            elif seconds >= 60:
-                                                                st.error(
-                                                                    f"Seconds must be less than 60. You entered {seconds} seconds."
+                                                                # Also check session state in case it was just changed
+                                                                if completion_key in st.session_state:
+                                                                    current_completion = st.session_state[
+                                                                        completion_key
+                                                                    ]
+
+                                                                # Preserve expanded state before rerun
+                                                                st.session_state[expanded_key] = True
+
+                                                                # Preserve stage expanded state
+                                                                st.session_state[stage_expanded_key] = True
+
+                                                                with engine.begin() as conn:
+                                                                    conn.execute(
+                                                                        INSERT_MANUAL_TIME_SQL,
+                                                                        {
+                                                                            'card_name': book_title,
+                                                                            'user_name': user_name,
+                                                                            'list_name': stage_name,
+                                                                            'time_spent_seconds': total_seconds,
+                                                                            'board_name': board_name,
+                                                                            'created_at': now_bst,
+                                                                            'tag': existing_tag,
+                                                                            'completed': current_completion,
+                                                                        },
+                                                                    )
+                                                                bump_data_version()
+
+                                                                # Store success message in session state for display
+                                                                add_flash_message(
+                                                                    task_key, f"Added {manual_time} to progress"
                                                                 )
+                                                            except Exception as e:
+                                                                st.error(f"Error saving time: {str(e)}")
                                                             else:
-                                                                total_seconds = hours * 3600 + minutes * 60 + seconds
+                                                                # Rerun so the totals include the new entry
+                                                                st.rerun()
 
-                                                                # Validate maximum time (100 hours = 360,000 seconds)
-                                                                max_seconds = 100 * 3600  # 360,000 seconds
-                                                                if total_seconds > max_seconds:
-                                                                    st.error(
-                                                                        f"Maximum time allowed is 100:00:00. You entered {manual_time}"
-                                                                    )
-                                                                elif total_seconds > 0:
-                                                                    # Add manual time to database
-                                                                    try:
-                                                                        # Get board name from original data
-                                                                        user_original_data = stage_data[
-                                                                            stage_data['User'] == user_name
-                                                                        ].iloc[0]
-                                                                        board_name = user_original_data['Board']
-                                                                        # Get existing tag from original data
-                                                                        existing_tag = (
-                                                                            user_original_data.get('Tag', None)
-                                                                            if 'Tag' in user_original_data
-                                                                            else None
-                                                                        )
-
-                                                                        # Get current completion status to preserve it
-                                                                        completion_key = f"complete_{book_title}_{stage_name}_{user_name}"
-                                                                        current_completion = get_task_completion(
-                                                                            engine, book_title, user_name, stage_name
-                                                                        )
-                                                                        # Also check session state in case it was just changed
-                                                                        if completion_key in st.session_state:
-                                                                            current_completion = st.session_state[
-                                                                                completion_key
-                                                                            ]
-
-                                                                        # Preserve expanded state before rerun
-                                                                        expanded_key = f"expanded_{book_title}"
-                                                                        st.session_state[expanded_key] = True
-
-                                                                        # Preserve stage expanded state
-                                                                        stage_expanded_key = (
-                                                                            f"stage_expanded_{book_title}_{stage_name}"
-                                                                        )
-                                                                        st.session_state[stage_expanded_key] = True
-
-                                                                        with engine.connect() as conn:
-                                                                            conn.execute(
-                                                                                text(
-                                                                                    '''
-                                                                                    INSERT INTO trello_time_tracking
-                                                                                    (card_name, user_name, list_name, time_spent_seconds, board_name, created_at, tag, completed)
-                                                                                    VALUES (:card_name, :user_name, :list_name, :time_spent_seconds, :board_name, :created_at, :tag, :completed)
-                                                                                '''
-                                                                                ),
-                                                                                {
-                                                                                    'card_name': book_title,
-                                                                                    'user_name': user_name,
-                                                                                    'list_name': stage_name,
-                                                                                    'time_spent_seconds': total_seconds,
-                                                                                    'board_name': board_name,
-                                                                                    'created_at': datetime.now(BST),
-                                                                                    'tag': existing_tag,
-                                                                                    'completed': current_completion,
-                                                                                },
-                                                                            )
-                                                                            conn.commit()
-
-                                                                        # Store success message in session state for display
-                                                                        success_msg_key = (
-                                                                            f"manual_time_success_{task_key}"
-                                                                        )
-                                                                        st.session_state[success_msg_key] = (
-                                                                            f"Added {manual_time} to progress"
-                                                                        )
-
-                                                                    except Exception as e:
-                                                                        st.error(f"Error saving time: {str(e)}")
-                                                                else:
-                                                                    st.error("Time must be greater than 00:00:00")
-                                                        else:
-                                                            st.error("Please use format hh:mm:ss (e.g., 01:30:00)")
-                                                    except ValueError:
-                                                        st.error("Please enter valid numbers in hh:mm:ss format")
-
-                                            # Display various success messages
-                                            # Timer success message
-                                            timer_success_key = f"timer_success_{task_key}"
-                                            if timer_success_key in st.session_state:
-                                                st.success(st.session_state[timer_success_key])
-                                                del st.session_state[timer_success_key]
-
-                                            # Manual time success message
-                                            manual_success_key = f"manual_time_success_{task_key}"
-                                            if manual_success_key in st.session_state:
-                                                st.success(st.session_state[manual_success_key])
-                                                del st.session_state[manual_success_key]
-
-                                            # Completion status success message
-                                            completion_success_key = f"completion_success_{task_key}"
-                                            if completion_success_key in st.session_state:
-                                                st.success(st.session_state[completion_success_key])
-                                                del st.session_state[completion_success_key]
-
-                                            # User reassignment success message
-                                            reassign_success_key = f"reassign_success_{book_title}_{stage_name}_{user_name}_{session_id}_{idx}"
-                                            if reassign_success_key in st.session_state:
-                                                st.success(st.session_state[reassign_success_key])
-                                                del st.session_state[reassign_success_key]
+                                            # Display success messages (timer, manual time, completion, reassignment)
+                                            for message in pop_flash_messages(task_key):
+                                                st.success(message)
 
                                 # Show count of running timers (refresh buttons now appear under individual timers)
-                                running_timers = [
-                                    k for k, v in st.session_state.timers.items() if v and book_title in k
-                                ]
-                                if running_timers:
-                                    st.write(f"{len(running_timers)} timer(s) running")
+                                if book_running_timers:
+                                    st.write(f"{len(book_running_timers)} timer(s) running")
 
                                 # Add stage dropdown
-                                available_stages = get_available_stages_for_book(engine, book_title)
+                                available_stages = available_stages_by_book.get(book_title, [])
                                 if available_stages:
                                     st.markdown("---")
                                     col1, col2 = st.columns([3, 1])
@@ -3142,7 +3487,7 @@ def main():
                                         current_time_estimate = st.session_state.get(time_estimate_key, 1.0)
 
                                         # Get book info for board name and tag
-                                        book_info = next((book for book in all_books if book[0] == book_title), None)
+                                        book_info = all_books_by_title.get(book_title)
                                         board_name = book_info[1] if book_info else None
                                         tag = book_info[2] if book_info else None
 
@@ -3160,27 +3505,26 @@ def main():
                                             st.error("Failed to add stage")
 
                                 # Remove stage section at the bottom left of each book
-                                if stages_grouped.groups:  # Only show if book has stages
+                                if stages_grouped.ngroups:  # Only show if book has stages
                                     st.markdown("---")
                                     remove_col1, remove_col2, remove_col3 = st.columns([2, 1, 1])
 
                                     with remove_col1:
                                         # Get all current stages for this book
-                                        current_stages_with_users = []
-                                        for stage_name in stage_order:
-                                            if stage_name in stages_grouped.groups:
-                                                stage_data = stages_grouped.get_group(stage_name)
-                                                user_aggregated = (
-                                                    stage_data.groupby('User')['Time spent (s)'].sum().reset_index()
-                                                )
-                                                for idx, user_task in user_aggregated.iterrows():
-                                                    user_name = user_task['User']
-                                                    user_display = (
-                                                        user_name
-                                                        if user_name and user_name != "Not set"
-                                                        else "Unassigned"
-                                                    )
-                                                    current_stages_with_users.append(f"{stage_name} ({user_display})")
+                                        # One groupby for every stage/user pair, then order by stage (users stay sorted)
+                                        stage_rank = {stage: rank for rank, stage in enumerate(stage_order)}
+                                        stage_user_pairs = sorted(
+                                            (
+                                                pair
+                                                for pair in book_data.groupby(['List', 'User'], observed=True).size().index
+                                                if pair[0] in stage_rank
+                                            ),
+                                            key=lambda pair: stage_rank[pair[0]],
+                                        )
+                                        current_stages_with_users = [
+                                            f"{stage_name} ({user_name if user_name and user_name != 'Not set' else 'Unassigned'})"
+                                            for stage_name, user_name in stage_user_pairs
+                                        ]
 
                                         if current_stages_with_users:
                                             selected_remove_stage = st.selectbox(
@@ -3223,59 +3567,8 @@ def main():
                                         help="Move this book to archive",
                                     ):
                                         try:
-                                            with engine.connect() as conn:
-                                                # Check if book has time tracking records
-                                                result = conn.execute(
-                                                    text(
-                                                        '''
-                                                        SELECT COUNT(*) FROM trello_time_tracking
-                                                        WHERE card_name = :card_name
-                                                    '''
-                                                    ),
-                                                    {'card_name': book_title},
-                                                )
-                                                record_count = result.scalar()
-
-                                                if record_count > 0:
-                                                    # Archive existing time tracking records
-                                                    conn.execute(
-                                                        text(
-                                                            '''
-                                                            UPDATE trello_time_tracking
-                                                            SET archived = TRUE
-                                                            WHERE card_name = :card_name
-                                                        '''
-                                                        ),
-                                                        {'card_name': book_title},
-                                                    )
-                                                else:
-                                                    # Create a placeholder archived record for books without tasks
-                                                    conn.execute(
-                                                        text(
-                                                            '''
-                                                            INSERT INTO trello_time_tracking
-                                                            (card_name, user_name, list_name, time_spent_seconds,
-                                                             card_estimate_seconds, board_name, archived, created_at)
-                                                            VALUES (:card_name, 'Not set', 'No tasks assigned', 0,
-                                                                   0, 'Manual Entry', TRUE, NOW())
-                                                        '''
-                                                        ),
-                                                        {'card_name': book_title},
-                                                    )
-
-                                                # Archive the book in books table
-                                                conn.execute(
-                                                    text(
-                                                        '''
-                                                        UPDATE books
-                                                        SET archived = TRUE
-                                                        WHERE card_name = :book_name
-                                                    '''
-                                                    ),
-                                                    {'book_name': book_title},
-                                                )
-
-                                                conn.commit()
+                                            # Archive time records and the book in one transaction
+                                            mutate_book_data(engine, ARCHIVE_BOOK_SQL, {'card_name': book_title})
 
                                             # Keep user on the current tab
                                             st.success(f"'{book_title}' has been archived successfully!")
@@ -3292,27 +3585,14 @@ def main():
                                     ):
                                         # Add confirmation using session state
                                         confirm_key = f"confirm_delete_progress_{book_title}"
-                                        if confirm_key not in st.session_state:
-                                            st.session_state[confirm_key] = False
-
-                                        if not st.session_state[confirm_key]:
+                                        if not st.session_state.setdefault(confirm_key, False):
                                             st.session_state[confirm_key] = True
                                             st.warning(
                                                 f"Click 'Delete {book_title}' again to permanently delete all data for this book."
                                             )
                                         else:
                                             try:
-                                                with engine.connect() as conn:
-                                                    conn.execute(
-                                                        text(
-                                                            '''
-                                                            DELETE FROM trello_time_tracking
-                                                            WHERE card_name = :card_name
-                                                        '''
-                                                        ),
-                                                        {'card_name': book_title},
-                                                    )
-                                                    conn.commit()
+                                                mutate_book_data(engine, DELETE_BOOK_TIME_SQL, {'card_names': [book_title]})
 
                                                 # Reset confirmation state
                                                 del st.session_state[confirm_key]
@@ -3322,8 +3602,7 @@ def main():
                                             except Exception as e:
                                                 st.error(f"Error deleting book: {str(e)}")
                                                 # Reset confirmation state on error
-                                                if confirm_key in st.session_state:
-                                                    del st.session_state[confirm_key]
+                                                st.session_state.pop(confirm_key, None)
 
                             stage_counter += 1
 
@@ -3333,13 +3612,20 @@ def main():
                     )
                     nav_col1, nav_col2 = st.columns(2)
                     with nav_col1:
-                        if st.button("Previous", disabled=st.session_state.book_page == 0):
-                            st.session_state.book_page -= 1
-                            st.rerun()
+                        # Callbacks move the page before the click's rerun, so no second st.rerun() is needed
+                        st.button(
+                            "Previous",
+                            disabled=st.session_state.book_page == 0,
+                            on_click=change_book_page,
+                            args=(-1,),
+                        )
                     with nav_col2:
-                        if st.button("Next", disabled=st.session_state.book_page >= total_pages - 1):
-                            st.session_state.book_page += 1
-                            st.rerun()
+                        st.button(
+                            "Next",
+                            disabled=st.session_state.book_page >= total_pages - 1,
+                            on_click=change_book_page,
+                            args=(1,),
+                        )
 
         except SQLAlchemyError as e:
             timestamp = datetime.now(BST).strftime("%Y-%m-%d %H:%M:%S")
@@ -3348,9 +3634,9 @@ def main():
                 {"time": timestamp, "message": f"Database error: {str(e)}"}
             )
             try:
-                import traceback
-
-                error_details = traceback.format_exc().split("\n")[-3:-1]
+                # Only the innermost frame is logged, so skip formatting the whole traceback
+                frame = traceback.extract_tb(e.__traceback__)[-1]
+                error_details = [f'File "{frame.filename}", line {frame.lineno}, in {frame.name}', frame.line or ""]
                 st.session_state.error_log.append(
                     {"time": timestamp, "message": f"Location: {' '.join(error_details)}"}
                 )
@@ -3367,9 +3653,9 @@ def main():
                 {"time": timestamp, "message": str(e)}
             )
             try:
-                import traceback
-
-                error_details = traceback.format_exc().split("\n")[-3:-1]
+                # Only the innermost frame is logged, so skip formatting the whole traceback
+                frame = traceback.extract_tb(e.__traceback__)[-1]
+                error_details = [f'File "{frame.filename}", line {frame.lineno}, in {frame.name}', frame.line or ""]
                 st.session_state.error_log.append(
                     {"time": timestamp, "message": f"Location: {' '.join(error_details)}"}
                 )
@@ -3383,49 +3669,42 @@ def main():
         st.markdown("---")
         st.subheader("All Books Overview")
 
-        # Create data for the table
-        table_data = []
-
-        # Create a dictionary to track books and their boards
-        book_board_map = {}
-
-        # First, add books with tasks from database
-        if df_from_db is not None and not df_from_db.empty and 'Card name' in df_from_db.columns:
-            try:
-                for _, row in df_from_db.groupby('Card name').first().iterrows():
-                    book_name = row['Card name']
-                    board_name = row['Board'] if 'Board' in row and row['Board'] else 'Not set'
-                    book_board_map[book_name] = board_name
-            except Exception as e:
-                # If groupby fails, fall back to simple iteration
-                pass
-
-        # Then add books without tasks from all_books
-        try:
-            for book_info in all_books:
-                book_name = book_info[0]
-                if book_name not in book_board_map:
-                    board_name = book_info[1] if book_info[1] else 'Not set'
-                    book_board_map[book_name] = board_name
-        except Exception as e:
-            # Handle case where all_books might be empty or malformed
-            pass
-
-        # Convert to sorted list for table display
-        for book_name in sorted(book_board_map.keys()):
-            table_data.append({'Book Name': book_name, 'Board': book_board_map[book_name]})
+        # Only build the table when asked for; it isn't needed on most reruns
+        if st.toggle("Show all books", key="show_books_overview"):
+            # Books with tasks come first so their board wins, then books without tasks from all_books
+            overview_frames = []
+            if df_from_db is not None and not df_from_db.empty and 'Card name' in df_from_db.columns:
+                overview_frames.append(
+                    df_from_db.reindex(columns=['Card name', 'Board'])
+                    .groupby('Card name', as_index=False, observed=True, sort=False)
+                    .first()
+                )
+            if all_books_by_title:
+                overview_frames.append(
+                    pd.DataFrame(
+                        [tuple(book_info[:2]) for book_info in all_books_by_title.values()],
+                        columns=['Card name', 'Board'],
+                    )
+                )
 
-        if table_data:
-            # Create DataFrame for display
-            table_df = pd.DataFrame(table_data)
-            st.dataframe(table_df, use_container_width=True, hide_index=True)
-        else:
-            st.info("No books found in the database.")
+            if overview_frames:
+                # Create DataFrame for display
+                table_df = (
+                    pd.concat(overview_frames, ignore_index=True)
+                    .drop_duplicates('Card name')
+                    .rename(columns={'Card name': 'Book Name'})
+                    .sort_values('Book Name')
+                )
+                table_df['Board'] = table_df['Board'].mask(
+                    table_df['Board'].isna() | (table_df['Board'] == ''), 'Not set'
+                )
+                st.dataframe(table_df, use_container_width=True, hide_index=True)
+            else:
+                st.info("No books found in the database.")
 
         # Clear refresh flags without automatic rerun to prevent infinite loops
         for flag in ['completion_changed', 'major_update_needed']:
-            if flag in st.session_state:
-                del st.session_state[flag]
+            st.session_state.pop(flag, None)
                 
         components.html(
         """
@@ -3449,180 +3728,7 @@ def main():
         height=300,
     )
     with reporting_tab:
-        st.header("Reporting")
-        st.markdown("Filter tasks by user, book, board, tag, and date range from all uploaded data.")
-
-        # Get filter options from database
-        users = get_users_from_database(engine)
-        books = get_books_from_database(engine)
-        boards = get_boards_from_database(engine)
-        tags = get_tags_from_database(engine)
-
-        if not users:
-            st.info("No users found in database. Please add entries in the 'Add Book' tab first.")
-            st.stop()
-
-        # Filter selection - organized in columns
-        col1, col2 = st.columns(2)
-
-        with col1:
-            # User selection dropdown
-            selected_user = st.selectbox(
-                "Select User:", options=["All Users"] + users, help="Choose a user to view their tasks"
-            )
-
-            # Book search input
-            book_search = st.text_input(
-                "Search Book (optional):",
-                placeholder="Start typing to search books...",
-                help="Type to search for a specific book",
-            )
-            # Match the search to available books
-            if book_search:
-                matched_books = [book for book in books if book_search.lower() in book.lower()]
-                if matched_books:
-                    selected_book = st.selectbox(
-                        "Select from matches:", options=matched_books, help="Choose from matching books"
-                    )
-                else:
-                    st.warning("No books found matching your search")
-                    selected_book = "All Books"
-            else:
-                selected_book = "All Books"
-
-        with col2:
-            # Board selection dropdown
-            selected_board = st.selectbox(
-                "Select Board (optional):", options=["All Boards"] + boards, help="Choose a specific board to filter by"
-            )
-
-            # Tag selection dropdown
-            selected_tag = st.selectbox(
-                "Select Tag (optional):", options=["All Tags"] + tags, help="Choose a specific tag to filter by"
-            )
-
-        # Date range selection
-        col1, col2 = st.columns(2)
-        with col1:
-            start_date = st.date_input("Start Date (optional):", value=None, help="Leave empty to include all dates")
-
-        with col2:
-            end_date = st.date_input("End Date (optional):", value=None, help="Leave empty to include all dates")
-
-        # Update button
-        update_button = st.button("Update Table", type="primary")
-
-        # Validate date range
-        if start_date and end_date and start_date > end_date:
-            st.error("Start date must be before end date")
-            return
-
-        # Filter and display results only when button is clicked or on initial load
-        if update_button or 'filtered_tasks_displayed' not in st.session_state:
-            with st.spinner("Loading filtered tasks..."):
-                filtered_tasks = get_filtered_tasks_from_database(
-                    engine,
-                    user_name=selected_user if selected_user != "All Users" else None,
-                    book_name=selected_book if selected_book != "All Books" else None,
-                    board_name=selected_board if selected_board != "All Boards" else None,
-                    tag_name=selected_tag if selected_tag != "All Tags" else None,
-                    start_date=start_date,
-                    end_date=end_date,
-                )
-
-            # Store in session state to prevent automatic reloading
-            st.session_state.filtered_tasks_displayed = True
-            st.session_state.current_filtered_tasks = filtered_tasks
-            st.session_state.current_filters = {
-                'user': selected_user,
-                'book': selected_book,
-                'board': selected_board,
-                'tag': selected_tag,
-                'start_date': start_date,
-                'end_date': end_date,
-            }
-
-        # Display cached results if available
-        if 'current_filtered_tasks' in st.session_state:
-
-            filtered_tasks = st.session_state.current_filtered_tasks
-            current_filters = st.session_state.get('current_filters', {})
-
-            if not filtered_tasks.empty:
-                st.subheader("Filtered Results")
-
-                # Show active filters info
-                active_filters = []
-                if current_filters.get('user') and current_filters.get('user') != "All Users":
-                    active_filters.append(f"User: {current_filters.get('user')}")
-                if current_filters.get('book') and current_filters.get('book') != "All Books":
-                    active_filters.append(f"Book: {current_filters.get('book')}")
-                if current_filters.get('board') and current_filters.get('board') != "All Boards":
-                    active_filters.append(f"Board: {current_filters.get('board')}")
-                if current_filters.get('tag') and current_filters.get('tag') != "All Tags":
-                    active_filters.append(f"Tag: {current_filters.get('tag')}")
-                if current_filters.get('start_date') or current_filters.get('end_date'):
-                    start_str = (
-                        current_filters.get('start_date').strftime('%d/%m/%Y')
-                        if current_filters.get('start_date')
-                        else 'All'
-                    )
-                    end_str = (
-                        current_filters.get('end_date').strftime('%d/%m/%Y')
-                        if current_filters.get('end_date')
-                        else 'All'
-                    )
-                    active_filters.append(f"Date range: {start_str} to {end_str}")
-
-                if active_filters:
-                    left_col, right_col = st.columns([1, 3])
-                    with left_col:
-                        with st.expander("Active Filters", expanded=False):
-                            for f in active_filters:
-                                st.write(f)
-                    with right_col:
-                        st.dataframe(filtered_tasks, use_container_width=True, hide_index=True)
-                else:
-                    st.dataframe(filtered_tasks, use_container_width=True, hide_index=True)
-
-                # Download button for filtered results
-                csv_buffer = io.StringIO()
-                filtered_tasks.to_csv(csv_buffer, index=False)
-                st.download_button(
-                    label="Download Filtered Results",
-                    data=csv_buffer.getvalue(),
-                    file_name="filtered_tasks.csv",
-                    mime="text/csv",
-                )
-
-                # Summary statistics for filtered data
-                st.subheader("Summary")
-                col1, col2, col3, col4 = st.columns(4)
-
-                with col1:
-                    st.metric("Total Books", int(filtered_tasks['Book Title'].nunique()))
-
-                with col2:
-                    st.metric("Total Tasks", len(filtered_tasks))
-
-                with col3:
-                    st.metric("Unique Users", int(filtered_tasks['User'].nunique()))
-
-                with col4:
-                    # Calculate total time from formatted time strings
-                    total_seconds = 0
-                    for time_str in filtered_tasks['Time Spent']:
-                        if time_str != "00:00:00":
-                            parts = time_str.split(':')
-                            total_seconds += int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-                    total_hours = total_seconds / 3600
-                    st.metric("Total Time (Hours)", f"{total_hours:.1f}")
-
-            else:
-                st.warning("No tasks found matching the selected filters.")
-
-        elif 'filtered_tasks_displayed' not in st.session_state:
-            st.info("Click 'Update Table' to load filtered results.")
+        render_reporting_tab(engine)
 
     with archive_tab:
         st.header("Archive")
@@ -3631,42 +3737,26 @@ def main():
         try:
             # Get count of archived records
             with engine.connect() as conn:
-                archived_count = conn.execute(
-                    text('SELECT COUNT(*) FROM trello_time_tracking WHERE archived = TRUE')
-                ).scalar()
+                archived_count = conn.execute(COUNT_ARCHIVED_SQL).scalar()
 
             if archived_count and archived_count > 0:
                 st.info(f"Showing archived books from {archived_count} database records.")
 
-                # Get archived data from database
-                df_archived = pd.read_sql(
-                    '''SELECT card_name as "Card name",
-                       COALESCE(user_name, 'Not set') as "User",
-                       list_name as "List",
-                       time_spent_seconds as "Time spent (s)",
-                       date_started as "Date started (f)",
-                       card_estimate_seconds as "Card estimate(s)",
-                       board_name as "Board", created_at, tag as "Tag"
-                       FROM trello_time_tracking WHERE archived = TRUE ORDER BY created_at DESC''',
-                    engine,
+                # Add search bar for archived book titles
+                archive_search_query = st.text_input(
+                    "Search archived books by title:",
+                    placeholder="Enter book title to filter archived results...",
+                    help="Search for specific archived books by typing part of the title",
+                    key="archive_search",
                 )
 
-                if not df_archived.empty:
-                    # Add search bar for archived book titles
-                    archive_search_query = st.text_input(
-                        "Search archived books by title:",
-                        placeholder="Enter book title to filter archived results...",
-                        help="Search for specific archived books by typing part of the title",
-                        key="archive_search",
-                    )
+                # Matched in the database; cached per search until the archived row count
+                # changes or this session writes
+                df_archived = load_archived_books(engine, archived_count, archive_search_query)
 
-                    # Filter archived books based on search
-                    filtered_archived_df = df_archived.copy()
-                    if archive_search_query:
-                        mask = filtered_archived_df['Card name'].str.contains(
-                            archive_search_query, case=False, na=False
-                        )
-                        filtered_archived_df = filtered_archived_df[mask]
+                if not df_archived.empty:
+                    # The cached frame is only read, never modified, so no copy is needed
+                    filtered_archived_df = df_archived
 
                     # Get unique archived books
                     unique_archived_books = filtered_archived_df['Card name'].unique()
@@ -3674,55 +3764,110 @@ def main():
                     if len(unique_archived_books) > 0:
                         st.write(f"Found {len(unique_archived_books)} archived books to display")
 
+                        # Bulk actions run one statement for every selected book
+                        selected_archived_books = st.multiselect(
+                            "Select archived books:",
+                            options=list(unique_archived_books),
+                            key="archive_bulk_select",
+                        )
+                        if selected_archived_books:
+                            bulk_col1, bulk_col2 = st.columns(2)
+
+                            with bulk_col1:
+                                if st.button("Unarchive selected", key="archive_bulk_unarchive"):
+                                    try:
+                                        mutate_book_data(
+                                            engine, UNARCHIVE_BOOK_TIME_SQL, {'card_names': selected_archived_books}
+                                        )
+
+                                        del st.session_state["archive_bulk_select"]
+                                        st.success(f"{len(selected_archived_books)} books have been unarchived successfully!")
+                                        st.rerun()
+                                    except Exception as e:
+                                        st.error(f"Error unarchiving books: {str(e)}")
+
+                            with bulk_col2:
+                                if st.button("Delete selected", key="archive_bulk_delete", type="secondary"):
+                                    # Confirm against the exact selection so a changed selection asks again
+                                    confirm_key = "confirm_delete_archive_selection"
+                                    if st.session_state.get(confirm_key) != tuple(selected_archived_books):
+                                        st.session_state[confirm_key] = tuple(selected_archived_books)
+                                        st.warning(
+                                            f"Click 'Delete selected' again to permanently delete all data for {len(selected_archived_books)} books."
+                                        )
+                                    else:
+                                        try:
+                                            mutate_book_data(
+                                                engine, DELETE_BOOK_TIME_SQL, {'card_names': selected_archived_books}
+                                            )
+
+                                            st.session_state.pop(confirm_key, None)
+                                            del st.session_state["archive_bulk_select"]
+                                            st.success(f"{len(selected_archived_books)} books have been permanently deleted!")
+                                            st.rerun()
+                                        except Exception as e:
+                                            st.error(f"Error deleting books: {str(e)}")
+                                            st.session_state.pop(confirm_key, None)
+
+                        archive_open = st.session_state.setdefault('archive_open', set())
+
+                        # Per-book totals in one pass (NaN treated as 0, as nansum did)
+                        archived_books_grouped = filtered_archived_df.groupby('Card name', sort=False)
+                        archived_book_totals = archived_books_grouped[['Time spent (s)', 'Card estimate(s)']].sum()
+
                         # Display each archived book with same structure as Book Completion
-                        for book_title in unique_archived_books:
-                            book_mask = filtered_archived_df['Card name'] == book_title
-                            book_data = filtered_archived_df[book_mask].copy()
-
-                            # Calculate overall progress
-                            total_time_spent = book_data['Time spent (s)'].sum()
-
-                            # Calculate total estimated time
-                            estimated_time = 0
-                            if 'Card estimate(s)' in book_data.columns:
-                                book_estimates = book_data['Card estimate(s)'].fillna(0).sum()
-                                if book_estimates > 0:
-                                    estimated_time = book_estimates
-
-                            # Calculate completion percentage and progress text
-                            if estimated_time > 0:
-                                completion_percentage = (total_time_spent / estimated_time) * 100
-                                progress_text = f"{format_seconds_to_time(total_time_spent)}/{format_seconds_to_time(estimated_time)} ({completion_percentage:.1f}%)"
-                            else:
-                                completion_percentage = 0
-                                progress_text = f"Total: {format_seconds_to_time(total_time_spent)} (No estimate)"
-
-                            with st.expander(book_title, expanded=False):
-                                # Show progress bar and completion info at the top
-                                progress_bar_html = f"""
-                                <div style="width: 50%; background-color: #f0f0f0; border-radius: 5px; height: 10px; margin: 8px 0;">
-                                    <div style="width: {min(completion_percentage, 100):.1f}%; background-color: #2AA395; height: 100%; border-radius: 5px;"></div>
-                                </div>
-                                """
-                                st.markdown(progress_bar_html, unsafe_allow_html=True)
-                                st.markdown(
-                                    f'<div style="font-size: 14px; color: #666; margin-bottom: 10px;">{progress_text}</div>',
-                                    unsafe_allow_html=True,
-                                )
+                        for book_title, book_data in archived_books_grouped:
+                            # Short stable suffix for this book's widget and confirmation keys
+                            book_key = stable_hash(book_title)
+
+                            # Details are only built for books the user has opened this session
+                            details_open = book_title in archive_open
+                            with st.expander(book_title, expanded=details_open):
+                                if details_open:
+                                    # Calculate overall progress
+                                    total_time_spent = archived_book_totals.at[book_title, 'Time spent (s)']
+
+                                    # Calculate total estimated time
+                                    estimated_time = 0
+                                    book_estimates = archived_book_totals.at[book_title, 'Card estimate(s)']
+                                    if book_estimates > 0:
+                                        estimated_time = book_estimates
+
+                                    # Calculate completion percentage and progress text
+                                    if estimated_time > 0:
+                                        completion_percentage = (total_time_spent / estimated_time) * 100
+                                        progress_text = f"{format_seconds_to_time(total_time_spent)}/{format_seconds_to_time(estimated_time)} ({completion_percentage:.1f}%)"
+                                    else:
+                                        completion_percentage = 0
+                                        progress_text = f"Total: {format_seconds_to_time(total_time_spent)} (No estimate)"
+
+                                    # Show progress bar and completion info at the top
+                                    st.progress(min(int(completion_percentage), 100), text=progress_text)
 
-                                st.markdown("---")
+                                    st.markdown("---")
 
-                                # Show task breakdown for archived book
-                                task_breakdown = (
-                                    book_data.groupby(['List', 'User'])['Time spent (s)'].sum().reset_index()
-                                )
-                                task_breakdown['Time Spent'] = task_breakdown['Time spent (s)'].apply(
-                                    format_seconds_to_time
-                                )
-                                task_breakdown = task_breakdown[['List', 'User', 'Time Spent']]
+                                    # Show task breakdown for archived book (already one row per stage/user)
+                                    # Build the display frame directly from the group, without an intermediate copy
+                                    task_breakdown = book_data[['List', 'User']].assign(
+                                        **{'Time Spent': format_seconds_series(book_data['Time spent (s)'])}
+                                    )
 
-                                st.write("**Task Breakdown:**")
-                                st.dataframe(task_breakdown, use_container_width=True, hide_index=True)
+                                    st.write("**Task Breakdown:**")
+                                    st.dataframe(task_breakdown, use_container_width=True, hide_index=True)
+
+                                    st.button(
+                                        "Hide details",
+                                        key=f"archive_details_{book_key}",
+                                        on_click=toggle_archive_details,
+                                        args=(book_title,),
+                                    )
+                                else:
+                                    st.button(
+                                        "Show details",
+                                        key=f"archive_details_{book_key}",
+                                        on_click=toggle_archive_details,
+                                        args=(book_title,),
+                                    )
 
                                 # Unarchive and Delete buttons
                                 st.markdown("---")
@@ -3731,22 +3876,15 @@ def main():
                                 with col1:
                                     if st.button(
                                         f"Unarchive '{book_title}'",
-                                        key=f"unarchive_{book_title}",
+                                        key=f"unarchive_{book_key}",
                                         help="Move this book back to active books",
                                     ):
                                         try:
-                                            with engine.connect() as conn:
-                                                conn.execute(
-                                                    text(
-                                                        '''
-                                                    UPDATE trello_time_tracking
-                                                    SET archived = FALSE
-                                                    WHERE card_name = :card_name
-                                                '''
-                                                    ),
-                                                    {'card_name': book_title},
-                                                )
-                                                conn.commit()
+                                            mutate_book_data(engine, UNARCHIVE_BOOK_TIME_SQL, {'card_names': [book_title]})
+
+                                            # This book leaves the archive, so drop its per-book state
+                                            st.session_state.pop(f"confirm_delete_{book_key}", None)
+                                            archive_open.discard(book_title)
 
                                             # Keep user on the Archive tab
                                             st.success(f"'{book_title}' has been unarchived successfully!")
@@ -3757,12 +3895,12 @@ def main():
                                 with col2:
                                     if st.button(
                                         f"Delete '{book_title}'",
-                                        key=f"delete_{book_title}",
+                                        key=f"delete_{book_key}",
                                         help="Permanently delete this book and all its data",
                                         type="secondary",
                                     ):
                                         # Add confirmation using session state
-                                        confirm_key = f"confirm_delete_{book_title}"
+                                        confirm_key = f"confirm_delete_{book_key}"
                                         if confirm_key not in st.session_state:
                                             st.session_state[confirm_key] = False
 
@@ -3774,20 +3912,11 @@ def main():
                                             st.rerun()
                                         else:
                                             try:
-                                                with engine.connect() as conn:
-                                                    conn.execute(
-                                                        text(
-                                                            '''
-                                                        DELETE FROM trello_time_tracking
-                                                        WHERE card_name = :card_name
-                                                    '''
-                                                        ),
-                                                        {'card_name': book_title},
-                                                    )
-                                                    conn.commit()
+                                                mutate_book_data(engine, DELETE_BOOK_TIME_SQL, {'card_names': [book_title]})
 
-                                                # Reset confirmation state
+                                                # Reset confirmation state and drop the book's other per-book state
                                                 del st.session_state[confirm_key]
+                                                archive_open.discard(book_title)
                                                 # Keep user on the Archive tab
                                                 st.success(f"'{book_title}' has been permanently deleted!")
                                                 st.rerun()
@@ -3801,6 +3930,8 @@ def main():
                             st.warning(f"No archived books found matching '{archive_search_query}'")
                         else:
                             st.warning("No archived books available")
+                elif archive_search_query:
+                    st.warning(f"No archived books found matching '{archive_search_query}'")
                 else:
                     st.warning("No archived books available")
             else:
@@ -3810,16 +3941,29 @@ def main():
             st.error(f"Error accessing archived data: {str(e)}")
     with error_log_tab:
         st.header("Error Log")
-        password_input = st.text_input(
-            "Enter password",
-            type="password",
-            key="error_log_password",
-        )
-        if password_input == "nan":
+        # A form validates the password once per submit instead of on every rerun
+        with st.form("error_log_form"):
+            password_input = st.text_input(
+                "Enter password",
+                type="password",
+                key="error_log_password",
+            )
+            submitted = st.form_submit_button("Unlock")
+        if submitted:
+            st.session_state['error_log_unlocked'] = hmac.compare_digest(
+                password_input.encode(), ERROR_LOG_PASSWORD.encode()
+            )
+        if st.session_state.get('error_log_unlocked'):
             if st.session_state.error_log:
                 df_log = pd.DataFrame(st.session_state.error_log)
                 st.dataframe(df_log, use_container_width=True, hide_index=True)
-                csv = df_log.to_csv(index=False).encode("utf-8")
+                # The log only grows, so its length tells us whether the encoded CSV is stale.
+                # Kept in session_state rather than st.cache_data, which is shared between sessions
+                log_length = len(st.session_state.error_log)
+                cached_length, csv = st.session_state.get('_error_log_csv', (None, b''))
+                if cached_length != log_length:
+                    csv = df_log.to_csv(index=False).encode("utf-8")
+                    st.session_state['_error_log_csv'] = (log_length, csv)
                 st.download_button(
                     "Download Error Log",
                     csv,
@@ -3828,7 +3972,7 @@ def main():
                 )
             else:
                 st.info("No errors logged yet.")
-        elif password_input:
+        elif submitted and password_input:
             st.warning("Incorrect password")
         else:
             st.info("Enter password to view logs")